@@ -0,0 +1,117 @@
+"""
+ASS Events
+Streaming reader for Advanced SubStation Alpha (.ass) scripts.
+
+Shared by the tools in this repository; it only depends on the standard
+library and never loads the whole script into memory.
+"""
+
+from collections import namedtuple
+import re
+
+
+EVENT_KINDS = ("Dialogue", "Comment")
+
+DEFAULT_FORMATS = {
+    "v4+ styles": (
+        "Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, "
+        "BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, "
+        "Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, "
+        "Encoding"
+    ).split(", "),
+    "events": (
+        "Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text"
+    ).split(", "),
+}
+
+Entry = namedtuple("Entry", "line section kind fields")
+
+OVERRIDE_PATTERN = re.compile(r"\{[^}]*\}|\\[Nnh]")
+
+
+def parse_timestamp(value):
+    """Convert an ASS timestamp (H:MM:SS.cc) to milliseconds."""
+    hours, minutes, seconds = value.strip().split(":")
+    return round((int(hours) * 3600 + int(minutes) * 60 + float(seconds)) * 1000)
+
+
+def format_timestamp(ms):
+    """Convert milliseconds to an ASS timestamp (H:MM:SS.cc)."""
+    cs = max(0, int(round(ms / 10)))
+    return f"{cs // 360000}:{cs // 6000 % 60:02d}:{cs // 100 % 60:02d}.{cs % 100:02d}"
+
+
+class ScriptParser:
+    """Incremental line parser; feed it lines in order with ``feed``."""
+
+    def __init__(self):
+        self.section = None
+        self.formats = {}
+
+    def feed(self, line_num, line):
+        """Parse one line, returning an Entry for styles/events or None."""
+        line = line.rstrip("\r\n")
+        if line.startswith("\ufeff"):
+            line = line[1:]
+        if line.startswith("["):
+            self.section = line.strip()[1:-1].lower()
+            return None
+
+        kind, sep, value = line.partition(":")
+        if not sep or self.section is None:
+            return None
+        kind = kind.strip()
+
+        if kind == "Format":
+            self.formats[self.section] = [f.strip() for f in value.split(",")]
+            return None
+
+        if kind not in EVENT_KINDS and kind != "Style":
+            return None
+
+        names = self.formats.get(self.section) or DEFAULT_FORMATS.get(self.section)
+        if not names:
+            return None
+        values = value.lstrip().split(",", len(names) - 1)
+        values += [""] * (len(names) - len(values))
+        return Entry(line_num, self.section, kind, dict(zip(names, values)))
+
+
+def read_script(lines):
+    """Yield an Entry for every formatted line (styles and events).
+
+    ``lines`` is any iterable of text lines, such as an open file. Each
+    Entry carries its 1-based line number, the lowercase section name, the
+    line kind ("Style", "Dialogue", "Comment") and a field dict built from
+    the section's Format line.
+    """
+    parser = ScriptParser()
+    for line_num, line in enumerate(lines, 1):
+        entry = parser.feed(line_num, line)
+        if entry is not None:
+            yield entry
+
+
+def read_events(lines):
+    """Yield only the Dialogue/Comment entries of a script."""
+    for entry in read_script(lines):
+        if entry.kind in EVENT_KINDS:
+            yield entry
+
+
+def plain_text(text):
+    """Strip override blocks and line-break escapes from event text."""
+    return OVERRIDE_PATTERN.sub(" ", text)
+
+
+def dialogue_lines(lines):
+    """Yield the plain text of every Dialogue event in a script."""
+    for entry in read_events(lines):
+        if entry.kind == "Dialogue":
+            yield plain_text(entry.fields.get("Text", ""))
+
+
+def format_event(kind, fields, names=None):
+    """Build an event line from a field dict (in Format order by default)."""
+    names = names or list(fields)
+    return f"{kind}: " + ",".join(str(fields.get(name, "")) for name in names)
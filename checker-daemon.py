@@ -0,0 +1,669 @@
+"""
+Checker Daemon
+Keeps terms indexes and number-word matchers warm for editor integrations.
+
+Loads the terms dictionaries and number-word matchers once, then answers
+"check this line/file" requests over JSON-RPC 2.0 (one JSON object per
+line) on a localhost TCP port or a Unix socket. See checker_client.py for
+a client and a throughput benchmark.
+
+Methods:
+check_text {text, terms?, threshold?, langs?, file?, phonetic?}
+check_file {path, terms?, threshold?, langs?, phonetic?}
+reload, stats, ping
+
+With --watch DIR it instead polls a directory of scripts, re-checks only
+the lines that changed on each save and prints the new and fixed issues.
+
+Installation:
+pip install rapidfuzz num2words
+
+To run:
+python checker-daemon.py --terms terms.txt [--port 8765 | --socket PATH]
+python checker-daemon.py --terms terms.txt --watch episodes/ [--json]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+from itertools import accumulate
+
+from ass_events import plain_text, read_script
+from checker_client import DEFAULT_HOST, DEFAULT_PORT
+from document_tokenizer import TokenizedDocument
+
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_THRESHOLD = 80
+MAX_LINE = 64 * 1024 * 1024
+SCRIPT_EXTENSIONS = (".ass", ".ssa")
+POLL_INTERVAL = 1.0
+DEBOUNCE = 0.5
+# Run one at a time on a worker thread, so a long scan does not stall the
+# other clients and the indexes are never used from two threads at once
+SCAN_METHODS = {"check_text", "check_file", "reload"}
+# An edited line is matched to a replacing line at least this similar,
+# looked up among the next EDIT_WINDOW lines of the changed block
+EDIT_SIMILARITY = 0.6
+EDIT_WINDOW = 20
+
+
+def load_tool(filename):
+    """Import one of the tool scripts (their file names are not importable)."""
+    name = os.path.splitext(filename)[0].replace("-", "_")
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(TOOLS_DIR, filename)
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+fuzzy = load_tool("fuzzy-text-checker.py")
+numbers = load_tool("number-word-detector.py")
+
+
+class RPCError(Exception):
+    """JSON-RPC error with its code."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class CheckerService:
+    """Warm state shared by every client: indexes, matchers and allow-lists."""
+
+    def __init__(self, terms_files=(), langs=("en", "pt_BR")):
+        self.terms = {}
+        self.default_terms = None
+        self.known_words = fuzzy.KnownWords()
+        self.known_words.load_user()
+        self.suppressions = {}
+        self.requests = 0
+        self.started = time.time()
+
+        for path in terms_files:
+            self.terms_index(path)
+        if terms_files:
+            self.default_terms = os.path.abspath(terms_files[0])
+
+        self.matcher = numbers.NumberMatcher()
+        for lang_code in langs:
+            words = numbers.build_number_words(lang_code)
+            self.matcher.add_language(lang_code, words)
+
+    def terms_index(self, path):
+        """Index of a terms file, reloaded incrementally when it changes."""
+        path = os.path.abspath(path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            raise RPCError(-32602, f"Terms file not found: {path}")
+
+        entry = self.terms.get(path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+        if entry is not None:
+            # Build a new index so in-flight scans keep a consistent one
+            index = fuzzy.TermsIndex()
+            index.terms = dict(entry[1].terms)
+            index.buckets = {k: dict(v) for k, v in entry[1].buckets.items()}
+            index.version = entry[1].version
+            index.source = entry[1].source
+        else:
+            index_path = fuzzy.terms_index_path(path)
+            index = fuzzy.TermsIndex.load(index_path) or fuzzy.TermsIndex()
+        added, removed = index.update(content)
+        if added or removed:
+            try:
+                index.save(fuzzy.terms_index_path(path))
+            except OSError:
+                pass
+        self.terms[path] = (mtime, index)
+        return index
+
+    def suppressed(self, terms_path, filename):
+        """Suppressed pairs from the workspace store, cached by file mtime."""
+        workspace = os.path.dirname(terms_path)
+        db_path = os.path.join(workspace, fuzzy.SUPPRESSIONS_FILE)
+        try:
+            mtime = os.stat(db_path).st_mtime_ns
+        except OSError:
+            return set()
+
+        key = (db_path, os.path.basename(filename or ""))
+        cached = self.suppressions.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        store = fuzzy.SuppressionStore(db_path)
+        try:
+            pairs = store.load(filename)
+        finally:
+            store.close()
+        self.suppressions[key] = (mtime, pairs)
+        return pairs
+
+    def check_text(
+        self,
+        text,
+        terms=None,
+        threshold=DEFAULT_THRESHOLD,
+        langs=None,
+        file=None,
+        phonetic=False,
+    ):
+        """Typos and number words of a line or document."""
+        if not isinstance(text, str):
+            raise RPCError(-32602, "'text' must be a string")
+        try:
+            threshold = float(threshold)
+        except (TypeError, ValueError):
+            raise RPCError(-32602, "'threshold' must be a number")
+        if not 0 <= threshold <= 100:
+            raise RPCError(-32602, "'threshold' must be between 0 and 100")
+        if langs is not None:
+            if not isinstance(langs, list) or not all(
+                isinstance(lang, str) for lang in langs
+            ):
+                raise RPCError(-32602, "'langs' must be a list of language codes")
+            unknown = sorted(set(langs) - set(self.matcher.values))
+            if unknown:
+                raise RPCError(-32602, f"Languages not loaded: {', '.join(unknown)}")
+        terms_path = os.path.abspath(terms) if terms else self.default_terms
+        document = TokenizedDocument(text)
+
+        typos = []
+        if terms_path:
+            table = fuzzy.ScoreTable.scan(
+                document,
+                self.terms_index(terms_path),
+                self.known_words,
+                self.suppressed(terms_path, file),
+                floor=threshold,
+                phonetic=bool(phonetic),
+            )
+            typos = table.results(threshold)
+
+        found = self.matcher.find(document, langs)
+        for occurrence in found:
+            occurrence["line"] = document.line_of(occurrence["start"])
+
+        return {"typos": typos, "numbers": found}
+
+    def check_lines(
+        self,
+        texts,
+        terms=None,
+        threshold=DEFAULT_THRESHOLD,
+        langs=None,
+        file=None,
+        phonetic=False,
+    ):
+        """Issues of several single lines, checked together in one scan.
+
+        Returns one list per text; offsets are relative to that text.
+        """
+        document = TokenizedDocument("\n".join(texts))
+        report = self.check_text(document.text, terms, threshold, langs, file, phonetic)
+        issues = [[] for _ in texts]
+        for typo in report["typos"]:
+            line_start = document.line_starts[typo["line"] - 1]
+            issues[typo["line"] - 1].append(
+                {
+                    "kind": "typo",
+                    "start": typo["start"] - line_start,
+                    "found": typo["found"],
+                    "term": typo["term"],
+                    "ratio": typo["ratio"],
+                }
+            )
+        for number in report["numbers"]:
+            line_start = document.line_starts[number["line"] - 1]
+            issues[number["line"] - 1].append(
+                {
+                    "kind": "number",
+                    "start": number["start"] - line_start,
+                    "found": number["text"],
+                    "values": number["values"],
+                    "kinds": number["kinds"],
+                }
+            )
+        return issues
+
+    def check_file(self, path, **params):
+        """Check a script on disk, the lines watch mode checks.
+
+        Only the Dialogue text of ASS/SSA scripts is checked; lines are the
+        script's, offsets are relative to the checked text of the line.
+        """
+        if not isinstance(path, str):
+            raise RPCError(-32602, "'path' must be a string")
+        try:
+            with open(path, "r", encoding="utf-8-sig") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            raise RPCError(-32602, f"Could not read {path}: {e}")
+        lines = checked_lines(content, path)
+        params.setdefault("file", path)
+        report = self.check_text("\n".join(text for _, text in lines), **params)
+
+        offsets = [0, *accumulate(len(text) + 1 for _, text in lines)]
+        for item in report["typos"] + report["numbers"]:
+            offset = offsets[item["line"] - 1]
+            item["line"] = lines[item["line"] - 1][0]
+            item["start"] -= offset
+            item["end"] -= offset
+        return report
+
+    def reload(self):
+        for path in list(self.terms):
+            self.terms_index(path)
+        self.known_words.load_user()
+        self.suppressions.clear()
+        return {"terms": len(self.terms)}
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "uptime": time.time() - self.started,
+            "terms": {path: len(index) for path, (_, index) in self.terms.items()},
+            "languages": sorted(self.matcher.values),
+        }
+
+    def dispatch(self, method, params):
+        """Run one request on the service."""
+        handlers = {
+            "check_text": self.check_text,
+            "check_file": self.check_file,
+            "reload": self.reload,
+            "stats": self.stats,
+            "ping": lambda: "pong",
+        }
+        if method not in handlers:
+            raise RPCError(-32601, f"Method not found: {method}")
+        self.requests += 1
+        try:
+            if isinstance(params, dict):
+                return handlers[method](**params)
+            return handlers[method](*params)
+        except TypeError as e:
+            raise RPCError(-32602, f"Invalid params: {e}")
+
+
+def checked_lines(content, filepath):
+    """``(line number, text)`` pairs to check: Dialogue text for ASS files."""
+    lines = content.split("\n")
+    if not filepath.lower().endswith(SCRIPT_EXTENSIONS):
+        return list(enumerate(lines, 1))
+    return [
+        (entry.line, plain_text(entry.fields.get("Text", "")))
+        for entry in read_script(lines)
+        if entry.kind == "Dialogue"
+    ]
+
+
+def matched_lines(previous, current):
+    """Map the line numbers of ``previous`` to those of ``current``.
+
+    Both are ``(line number, text)`` lists. Unchanged lines map to their new
+    position; an edited line maps to the most similar line of the block that
+    replaced it, keeping the order.
+    """
+    matcher = SequenceMatcher(
+        None, [text for _, text in previous], [text for _, text in current], False
+    )
+    moved = {}
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            for k in range(i2 - i1):
+                moved[previous[i1 + k][0]] = current[j1 + k][0]
+        elif tag == "replace":
+            j = j1
+            for i in range(i1, i2):
+                similar = SequenceMatcher(None, b=previous[i][1], autojunk=False)
+                best, best_ratio = None, EDIT_SIMILARITY
+                for k in range(j, min(j2, j + EDIT_WINDOW)):
+                    similar.set_seq1(current[k][1])
+                    if similar.real_quick_ratio() < best_ratio:
+                        continue
+                    ratio = similar.ratio()
+                    if ratio > best_ratio or best is None and ratio == best_ratio:
+                        best, best_ratio = k, ratio
+                if best is not None:
+                    moved[previous[i][0]] = current[best][0]
+                    j = best + 1
+    return moved
+
+
+def issue_message(issue):
+    """Describe an issue in one line."""
+    if issue["kind"] == "typo":
+        return f"'{issue['found']}' -> '{issue['term']}' ({issue['ratio']:.0f}%)"
+    values = ", ".join(
+        f"{numbers.format_value(issue['kinds'][lang], value)} [{lang}]"
+        for lang, value in issue["values"].items()
+    )
+    return f"number '{issue['found']}' = {values}"
+
+
+class ScriptWatcher:
+    """Re-checks the scripts of a directory whenever they are saved.
+
+    Polls file signatures (mtime and size) with ``os.scandir``, which costs
+    a handful of stat calls per interval while idle. A file is checked once
+    its signature has been stable for ``debounce`` seconds, and only lines
+    whose text changed since the previous check are analyzed. Lines are
+    matched to their previous version with difflib and issues are keyed by
+    that line identity plus what was found, so inserting lines or editing
+    one word of a line does not report its other issues again. Changes to
+    the terms, known words or suppressions invalidate the cached lines.
+    """
+
+    def __init__(
+        self,
+        service,
+        directory,
+        threshold=DEFAULT_THRESHOLD,
+        langs=None,
+        debounce=DEBOUNCE,
+        output=None,
+        as_json=False,
+        phonetic=False,
+    ):
+        self.service = service
+        self.directory = directory
+        self.threshold = threshold
+        self.langs = langs
+        self.debounce = debounce
+        self.output = output or sys.stdout
+        self.as_json = as_json
+        self.phonetic = phonetic
+        self.checked = {}
+        self.pending = {}
+        self.line_cache = {}
+        self.lines = {}
+        self.issues = {}
+        self.generation = None
+
+    def scan_directory(self):
+        """Signatures of the scripts currently in the directory."""
+        signatures = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith(SCRIPT_EXTENSIONS) and entry.is_file():
+                    stat = entry.stat()
+                    signatures[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def current_generation(self):
+        """Signature of everything the cached results depend on."""
+        paths = list(self.service.terms) + [self.service.known_words.user_path]
+        if self.service.default_terms:
+            workspace = os.path.dirname(self.service.default_terms)
+            paths.append(os.path.join(workspace, fuzzy.SUPPRESSIONS_FILE))
+        generation = []
+        for path in paths:
+            try:
+                generation.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                generation.append(None)
+        return tuple(generation)
+
+    def poll(self, now=None):
+        """Check whatever changed since the last poll; returns the files checked."""
+        now = time.monotonic() if now is None else now
+        generation = self.current_generation()
+        if generation != self.generation:
+            if self.generation is not None:
+                self.service.reload()
+            self.generation = generation
+            self.line_cache.clear()
+            self.checked.clear()
+
+        signatures = self.scan_directory()
+        for path in list(self.checked):
+            if path not in signatures:
+                self.report(path, [], self.issues.pop(path, []), {})
+                del self.checked[path]
+                self.line_cache.pop(path, None)
+                self.lines.pop(path, None)
+
+        ready = []
+        for path, signature in signatures.items():
+            if self.checked.get(path) == signature:
+                self.pending.pop(path, None)
+                continue
+            seen = self.pending.get(path)
+            if seen is None or seen[0] != signature:
+                self.pending[path] = (signature, now)
+            elif now - seen[1] >= self.debounce:
+                ready.append(path)
+
+        for path in sorted(ready):
+            signature = self.pending.pop(path)[0]
+            try:
+                self.check_file(path)
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"{path}: {e}", file=sys.stderr)
+            self.checked[path] = signature
+        return ready
+
+    def check_file(self, path):
+        """Re-check the changed lines of a script and report the difference."""
+        with open(path, "r", encoding="utf-8-sig") as f:
+            content = f.read()
+        lines = checked_lines(content, path)
+        cache = self.line_cache.get(path, {})
+
+        missing = list(dict.fromkeys(t for _, t in lines if t not in cache))
+        if missing:
+            checked = self.service.check_lines(
+                missing,
+                threshold=self.threshold,
+                langs=self.langs,
+                file=path,
+                phonetic=self.phonetic,
+            )
+            cache.update(zip(missing, checked))
+        texts = {text for _, text in lines}
+        self.line_cache[path] = {t: v for t, v in cache.items() if t in texts}
+
+        issues = [
+            dict(issue, line=line_num, text=text)
+            for line_num, text in lines
+            for issue in cache[text]
+        ]
+        moved = matched_lines(self.lines.get(path, []), lines)
+        self.report(path, issues, self.issues.get(path, []), moved)
+        self.issues[path] = issues
+        self.lines[path] = lines
+
+    def report(self, path, issues, previous, moved):
+        """Print the issues that appeared or disappeared since ``previous``.
+
+        ``moved`` maps the previous line numbers to the current ones.
+        """
+
+        def keyed(issues, line_of):
+            # The same word found twice on a line is told apart by its rank
+            seen = Counter()
+            keys = {}
+            for issue in issues:
+                key = (
+                    line_of(issue["line"]),
+                    issue["kind"],
+                    issue["found"],
+                    issue.get("term"),
+                )
+                seen[key] += 1
+                keys[key + (seen[key],)] = issue
+            return keys
+
+        before = keyed(previous, lambda line: moved.get(line, -line))
+        after = keyed(issues, lambda line: line)
+        fixed = [issue for k, issue in before.items() if k not in after]
+        new = [issue for k, issue in after.items() if k not in before]
+
+        name = os.path.relpath(path, self.directory)
+        for status, changed in (("fixed", fixed), ("new", new)):
+            for issue in changed:
+                if self.as_json:
+                    record = {"file": name, "status": status}
+                    record.update(
+                        (k, v) for k, v in issue.items() if k not in ("start", "text")
+                    )
+                    line = json.dumps(record, ensure_ascii=False)
+                else:
+                    sign = "+" if status == "new" else "-"
+                    line = f"{sign} {name}:{issue['line']}: {issue_message(issue)}"
+                print(line, file=self.output, flush=True)
+
+    async def run(self, interval=POLL_INTERVAL):
+        """Poll forever."""
+        while True:
+            self.poll()
+            await asyncio.sleep(interval)
+
+
+def handle_request(service, line):
+    """Turn one request line into a response object (None for notifications)."""
+    try:
+        request = json.loads(line)
+    except ValueError:
+        error = {"code": -32700, "message": "Parse error"}
+        return {"jsonrpc": "2.0", "id": None, "error": error}
+    return respond(service, request)
+
+
+def respond(service, request):
+    """Run a decoded request; returns its response (None for notifications)."""
+    request_id = request.get("id") if isinstance(request, dict) else None
+    try:
+        method = request.get("method") if isinstance(request, dict) else None
+        if not isinstance(method, str):
+            raise RPCError(-32600, "Invalid request")
+        result = service.dispatch(method, request.get("params", {}))
+    except RPCError as e:
+        response = {"code": e.code, "message": str(e)}
+        return {"jsonrpc": "2.0", "id": request_id, "error": response}
+    except Exception as e:
+        response = {"code": -32000, "message": f"{type(e).__name__}: {e}"}
+        return {"jsonrpc": "2.0", "id": request_id, "error": response}
+
+    if "id" not in request:
+        return None
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+async def serve(service, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None):
+    """Serve clients until cancelled; every connection gets its own task."""
+
+    loop = asyncio.get_running_loop()
+    scanner = ThreadPoolExecutor(max_workers=1)
+
+    async def handle_client(reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = handle_request(service, line)
+                else:
+                    if (
+                        isinstance(request, dict)
+                        and request.get("method") in SCAN_METHODS
+                    ):
+                        response = await loop.run_in_executor(
+                            scanner, respond, service, request
+                        )
+                    else:
+                        response = respond(service, request)
+                if response is not None:
+                    writer.write(json.dumps(response, ensure_ascii=False).encode())
+                    writer.write(b"\n")
+                    await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    if socket_path:
+        server = await asyncio.start_unix_server(
+            handle_client, path=socket_path, limit=MAX_LINE
+        )
+        address = socket_path
+    else:
+        server = await asyncio.start_server(
+            handle_client, host=host, port=port, limit=MAX_LINE
+        )
+        address = f"{host}:{port}"
+
+    print(f"Checker daemon listening on {address}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        scanner.shutdown(wait=False, cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzzy/number checker daemon")
+    parser.add_argument(
+        "--terms", action="append", default=[], help="Terms file (repeatable)"
+    )
+    parser.add_argument(
+        "--langs", nargs="+", default=["en", "pt_BR"], help="Number-word languages"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", dest="socket_path", help="Unix socket path")
+    parser.add_argument("--watch", metavar="DIR", help="Watch a script directory")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL)
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE)
+    parser.add_argument(
+        "--json", action="store_true", help="Stream watch results as JSON lines"
+    )
+    parser.add_argument(
+        "--phonetic", action="store_true", help="Romanization-aware watch checks"
+    )
+    args = parser.parse_args()
+
+    service = CheckerService(args.terms, args.langs)
+    if args.watch:
+        watcher = ScriptWatcher(
+            service,
+            args.watch,
+            threshold=args.threshold,
+            debounce=args.debounce,
+            as_json=args.json,
+            phonetic=args.phonetic,
+        )
+        main_task = watcher.run(args.interval)
+    else:
+        main_task = serve(service, args.host, args.port, args.socket_path)
+    try:
+        asyncio.run(main_task)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
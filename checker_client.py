@@ -0,0 +1,171 @@
+"""
+Checker Client
+Small client for the checker daemon (checker-daemon.py).
+
+The daemon speaks JSON-RPC 2.0, one JSON object per line, over a localhost
+TCP port or a Unix socket, so editor scripts can also talk to it directly.
+
+Usage:
+from checker_client import CheckerClient
+
+with CheckerClient() as client:
+    report = client.check_text("Shinobou said three words", terms="terms.txt")
+
+Benchmark (with the daemon running):
+python checker_client.py --benchmark --requests 5000 --clients 8
+"""
+
+import argparse
+import itertools
+import json
+import socket
+import threading
+import time
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class CheckerError(Exception):
+    """Error returned by the checker daemon."""
+
+    def __init__(self, code, message):
+        super().__init__(f"{message} ({code})")
+        self.code = code
+
+
+class CheckerClient:
+    """Blocking JSON-RPC client; one connection, one request at a time."""
+
+    def __init__(
+        self, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None, timeout=30
+    ):
+        if socket_path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(socket_path)
+        else:
+            self.sock = socket.create_connection((host, port), timeout=timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("r", encoding="utf-8", newline="\n")
+        self.ids = itertools.count(1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def call(self, method, **params):
+        """Send a request and return its result (raises CheckerError)."""
+        request_id = next(self.ids)
+        request = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params:
+            request["params"] = params
+        self.sock.sendall(json.dumps(request, ensure_ascii=False).encode() + b"\n")
+
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Checker daemon closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            error = response["error"]
+            raise CheckerError(error.get("code"), error.get("message"))
+        return response["result"]
+
+    def ping(self):
+        return self.call("ping")
+
+    def check_text(self, text, **params):
+        """Check a line or a whole document; returns typos and numbers."""
+        return self.call("check_text", text=text, **params)
+
+    def check_file(self, path, **params):
+        """Check a script on disk (as seen by the daemon)."""
+        return self.call("check_file", path=path, **params)
+
+    def reload(self):
+        """Ask the daemon to reload every terms file."""
+        return self.call("reload")
+
+    def stats(self):
+        return self.call("stats")
+
+
+def benchmark(requests, clients, text, **connect):
+    """Measure requests per second with several concurrent clients."""
+    per_client = max(1, requests // clients)
+    latencies = []
+    lock = threading.Lock()
+
+    def worker():
+        with CheckerClient(**connect) as client:
+            client.ping()
+            local = []
+            for _ in range(per_client):
+                start = time.perf_counter()
+                client.check_text(text)
+                local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "clients": clients,
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checker daemon client")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", dest="socket_path", help="Unix socket path")
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument(
+        "--text",
+        default="Dialogue: 0,0:00:01.00,0:00:03.00,Default,,0,0,0,,"
+        "Shinobou bought three hundred and forty-two donuts.",
+    )
+    parser.add_argument("file", nargs="?", help="Script to check")
+    args = parser.parse_args()
+    connect = {"host": args.host, "port": args.port, "socket_path": args.socket_path}
+
+    if args.benchmark:
+        report = benchmark(args.requests, args.clients, args.text, **connect)
+        print(
+            f"{report['requests']} requests, {report['clients']} clients: "
+            f"{report['requests_per_second']:.0f} req/s "
+            f"(p50 {report['p50_ms']:.2f} ms, p99 {report['p99_ms']:.2f} ms)"
+        )
+        return
+
+    with CheckerClient(**connect) as client:
+        if args.file:
+            result = client.check_file(args.file)
+        else:
+            result = client.check_text(args.text)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Document Tokenizer
+Single-pass tokenizer shared by the text tools.
+
+Walks a document once with a precompiled pattern, keeping token spans in
+compact arrays and a table of line-start offsets, so mapping an offset to
+its line/column is a binary search instead of per-line bookkeeping.
+"""
+
+from array import array
+from itertools import accumulate
+import bisect
+import re
+
+
+WORD_PATTERN = re.compile(r"\b[\w\-]+\b")
+SCAN_PATTERN = re.compile(r"\n|" + WORD_PATTERN.pattern)
+
+
+class TokenizedDocument:
+    """Token spans and line-start offsets of a document."""
+
+    def __init__(self, text):
+        self.text = text
+        self.starts = array("I")
+        self.ends = array("I")
+        self.line_starts = array("I", [0])
+
+        add_start = self.starts.append
+        add_end = self.ends.append
+        add_line = self.line_starts.append
+        for match in SCAN_PATTERN.finditer(text):
+            start, end = match.span()
+            if text[start] == "\n":
+                add_line(end)
+            else:
+                add_start(start)
+                add_end(end)
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def line_count(self):
+        return len(self.line_starts)
+
+    def token(self, i):
+        """Text of the i-th token."""
+        return self.text[self.starts[i] : self.ends[i]]
+
+    def tokens(self):
+        """Yield ``(start, end, text)`` for every token, in order."""
+        text = self.text
+        for start, end in zip(self.starts, self.ends):
+            yield start, end, text[start:end]
+
+    def token_range(self, first_line, last_line):
+        """Token indices ``(begin, end)`` covering lines first..last (1-based)."""
+        low = self.line_bounds(first_line)[0]
+        high = self.line_bounds(last_line)[1]
+        return (
+            bisect.bisect_left(self.starts, low),
+            bisect.bisect_left(self.starts, high),
+        )
+
+    def line_of(self, offset):
+        """1-based line number containing ``offset``."""
+        return bisect.bisect_right(self.line_starts, offset)
+
+    def line_col(self, offset):
+        """``(line, column)`` of an offset; line is 1-based, column 0-based."""
+        line = bisect.bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1]
+
+    def line_bounds(self, line):
+        """``(start, end)`` offsets of a 1-based line, without its newline."""
+        start = self.line_starts[line - 1]
+        if line < len(self.line_starts):
+            return start, self.line_starts[line] - 1
+        return start, len(self.text)
+
+    def line_text(self, line):
+        """Text of a 1-based line."""
+        start, end = self.line_bounds(line)
+        return self.text[start:end]
+
+    def replace_spans(self, spans, replacement):
+        """Replace sorted, non-overlapping ``(start, end)`` spans with a string.
+
+        Token and line offsets are shifted in place; every replaced span
+        becomes a single token. Returns a function mapping old offsets to
+        new ones.
+        """
+        text = self.text
+        pieces = []
+        last = 0
+        for start, end in spans:
+            pieces.append(text[last:start])
+            pieces.append(replacement)
+            last = end
+        pieces.append(text[last:])
+        self.text = "".join(pieces)
+
+        bounds = [end for _, end in spans]
+        deltas = list(
+            accumulate(len(replacement) - (end - start) for start, end in spans)
+        )
+
+        def shift(offset):
+            # Offsets move by the size change of every span ending before them
+            k = bisect.bisect_right(bounds, offset)
+            return offset + deltas[k - 1] if k else offset
+
+        first = spans[0][0] if spans else len(text)
+        for offsets in (self.starts, self.ends, self.line_starts):
+            i = bisect.bisect_left(offsets, first)
+            offsets[i:] = array(offsets.typecode, map(shift, offsets[i:]))
+        return shift
+
+    def tk_index(self, offset):
+        """Tk text index ("line.column") of an offset."""
+        line, col = self.line_col(offset)
+        return f"{line}.{col}"
@@ -0,0 +1,393 @@
+"""
+Font Checker
+Compares the fonts an ASS script uses with a fonts .zip before muxing.
+
+Streams the script once, collecting the fonts of the styles its dialogue
+uses and of inline \\fn overrides, then reads the font names (family and
+full name) straight out of the zip members in memory. Reports fonts the
+script needs but the archive lacks, and font files nothing refers to.
+
+To run:
+python font-checker.py
+python font-checker.py episode.ass fonts.zip
+"""
+
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from ass_events import read_script
+import argparse
+import os
+import re
+import struct
+import sys
+import zipfile
+
+
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc", ".otc")
+NAME_IDS = (1, 4, 16)  # family, full name, typographic family
+OVERRIDE_BLOCK_PATTERN = re.compile(r"\{([^}]*)\}")
+FONT_OVERRIDE_PATTERN = re.compile(r"\\(fn|r)([^\\}]*)")
+
+
+def font_key(name):
+    """Comparison key of a font name ("@" marks vertical text in ASS)."""
+    return name.strip().lstrip("@").strip().casefold()
+
+
+def style_key(name):
+    """Style names are matched like VSFilter does (a leading "*" is ignored)."""
+    return name.strip().lstrip("*")
+
+
+def script_fonts(lines):
+    """Map font keys to ``(font name, first use)`` for a script.
+
+    Only styles used by Dialogue events (directly or through ``\\r``) count,
+    plus every ``\\fn`` override. A first use is a style name or "line N".
+    """
+    style_fonts = {}
+    used_styles = set()
+    fonts = {}
+
+    for entry in read_script(lines):
+        if entry.kind == "Style":
+            style = style_key(entry.fields.get("Name", ""))
+            style_fonts[style] = entry.fields.get("Fontname", "")
+            continue
+        if entry.kind != "Dialogue":
+            continue
+
+        used_styles.add(style_key(entry.fields.get("Style", "")))
+        for block in OVERRIDE_BLOCK_PATTERN.findall(entry.fields.get("Text", "")):
+            for tag, value in FONT_OVERRIDE_PATTERN.findall(block):
+                value = value.strip()
+                if not value:
+                    continue
+                if tag == "r":
+                    used_styles.add(style_key(value))
+                else:
+                    fonts.setdefault(font_key(value), (value, f"line {entry.line}"))
+
+    for style in used_styles:
+        name = style_fonts.get(style)
+        if name and font_key(name):
+            fonts.setdefault(font_key(name), (name.strip(), f"style {style}"))
+    return fonts
+
+
+def decode_name(platform_id, encoding_id, data):
+    """Decode a 'name' table string, or None for unsupported encodings."""
+    if platform_id in (0, 3):
+        return data.decode("utf-16-be", errors="replace")
+    if platform_id == 1 and encoding_id == 0:
+        return data.decode("mac_roman", errors="replace")
+    return None
+
+
+def sfnt_names(data, offset=0):
+    """Family and full names of the font whose offset table is at ``offset``."""
+    num_tables = struct.unpack_from(">H", data, offset + 4)[0]
+    for i in range(num_tables):
+        tag, _, table_offset, _ = struct.unpack_from(
+            ">4sIII", data, offset + 12 + 16 * i
+        )
+        if tag == b"name":
+            break
+    else:
+        return set()
+
+    _, count, string_offset = struct.unpack_from(">HHH", data, table_offset)
+    strings = table_offset + string_offset
+    names = set()
+    for i in range(count):
+        platform_id, encoding_id, _, name_id, length, start = struct.unpack_from(
+            ">HHHHHH", data, table_offset + 6 + 12 * i
+        )
+        if name_id not in NAME_IDS:
+            continue
+        name = decode_name(
+            platform_id, encoding_id, data[strings + start : strings + start + length]
+        )
+        if name and name.strip():
+            names.add(name.strip())
+    return names
+
+
+def font_names(data):
+    """Names of every font in a TrueType/OpenType file or collection."""
+    if data[:4] == b"ttcf":
+        num_fonts = struct.unpack_from(">I", data, 8)[0]
+        offsets = struct.unpack_from(f">{num_fonts}I", data, 12)
+    else:
+        offsets = (0,)
+
+    names = set()
+    for offset in offsets:
+        names |= sfnt_names(data, offset)
+    return names
+
+
+def archive_fonts(path):
+    """Map each font file of a zip (or a single font file) to its names.
+
+    The zip central directory lists the members; each font is read into
+    memory, never extracted. Unreadable fonts map to an empty set.
+    """
+    if not zipfile.is_zipfile(path):
+        with open(path, "rb") as f:
+            return {os.path.basename(path): _safe_font_names(f.read())}
+
+    fonts = {}
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not info.filename.lower().endswith(FONT_EXTENSIONS):
+                continue
+            fonts[info.filename] = _safe_font_names(archive.read(info))
+    return fonts
+
+
+def _safe_font_names(data):
+    try:
+        return font_names(data)
+    except struct.error:
+        return set()
+
+
+def compare_fonts(needed, provided):
+    """Return ``(missing, unused)``.
+
+    ``missing`` lists the ``(font name, first use)`` pairs no file provides;
+    ``unused`` lists the font files none of whose names the script uses.
+    """
+    available = set()
+    unused = []
+    for filename, names in provided.items():
+        keys = {font_key(name) for name in names}
+        available |= keys
+        if keys.isdisjoint(needed):
+            unused.append(filename)
+
+    missing = [needed[key] for key in sorted(needed) if key not in available]
+    return missing, sorted(unused)
+
+
+def check_fonts(script_path, archive_paths):
+    """Compare a script with one or more font archives."""
+    with open(script_path, "r", encoding="utf-8-sig") as f:
+        needed = script_fonts(f)
+    provided = {}
+    for path in archive_paths:
+        provided.update(archive_fonts(path))
+    return compare_fonts(needed, provided)
+
+
+class FontCheckerApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Font Checker")
+        self.root.geometry("800x550")
+
+        self.colors = {
+            "primary": "#2196F3",
+            "primary_dark": "#1976D2",
+            "accent": "#FF5722",
+            "success": "#4CAF50",
+            "text": "#212121",
+            "text_secondary": "#757575",
+            "bg": "#FFFFFF",
+            "bg_light": "#f5f5f5",
+        }
+
+        self.script_var = tk.StringVar()
+        self.archive_var = tk.StringVar()
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Create the user interface."""
+        self.root.configure(bg=self.colors["bg_light"])
+
+        header_frame = tk.Frame(self.root, bg=self.colors["primary"], height=80)
+        header_frame.pack(fill=tk.X)
+        header_frame.pack_propagate(False)
+
+        tk.Label(
+            header_frame,
+            text="🔤 Font Checker",
+            font=("Segoe UI", 20, "bold"),
+            bg=self.colors["primary"],
+            fg="white",
+        ).pack(side=tk.LEFT, pady=20, padx=20)
+
+        tk.Label(
+            header_frame,
+            text="Find missing and unused fonts before muxing",
+            font=("Segoe UI", 10),
+            bg=self.colors["primary"],
+            fg="white",
+        ).pack(side=tk.LEFT, pady=20)
+
+        main_frame = tk.Frame(self.root, bg=self.colors["bg"])
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        main_frame.grid_columnconfigure(1, weight=1)
+        main_frame.grid_rowconfigure(4, weight=1)
+
+        for row, (label, variable, command) in enumerate(
+            (
+                ("Script:", self.script_var, self._browse_script),
+                ("Fonts:", self.archive_var, self._browse_archive),
+            )
+        ):
+            tk.Label(
+                main_frame,
+                text=label,
+                font=("Segoe UI", 9),
+                bg=self.colors["bg"],
+                fg=self.colors["text"],
+            ).grid(row=row, column=0, sticky="w", padx=(15, 5), pady=(15, 0))
+            tk.Entry(main_frame, textvariable=variable, font=("Segoe UI", 9)).grid(
+                row=row, column=1, sticky="ew", pady=(15, 0)
+            )
+            tk.Button(
+                main_frame,
+                text="BROWSE",
+                font=("Segoe UI", 9, "bold"),
+                bg=self.colors["primary"],
+                fg="white",
+                activebackground=self.colors["primary_dark"],
+                activeforeground="white",
+                relief=tk.FLAT,
+                cursor="hand2",
+                padx=10,
+                command=command,
+            ).grid(row=row, column=2, padx=15, pady=(15, 0))
+
+        check_btn = tk.Button(
+            main_frame,
+            text="CHECK FONTS",
+            font=("Segoe UI", 10, "bold"),
+            bg=self.colors["accent"],
+            fg="white",
+            activebackground="#E64A19",
+            activeforeground="white",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=20,
+            command=self._check,
+        )
+        check_btn.grid(row=2, column=0, columnspan=3, pady=15)
+
+        self.status_label = tk.Label(
+            main_frame,
+            text="",
+            font=("Segoe UI", 9),
+            bg=self.colors["bg"],
+            fg=self.colors["text_secondary"],
+        )
+        self.status_label.grid(row=3, column=0, columnspan=3, sticky="w", padx=15)
+
+        lists_frame = tk.Frame(main_frame, bg=self.colors["bg"])
+        lists_frame.grid(
+            row=4, column=0, columnspan=3, sticky="nsew", padx=15, pady=(5, 15)
+        )
+        lists_frame.grid_rowconfigure(1, weight=1)
+        lists_frame.grid_columnconfigure(0, weight=1)
+        lists_frame.grid_columnconfigure(1, weight=1)
+
+        self.missing_listbox = self._create_list(lists_frame, 0, "Missing fonts")
+        self.unused_listbox = self._create_list(lists_frame, 1, "Unused font files")
+
+    def _create_list(self, parent, column, title):
+        tk.Label(
+            parent,
+            text=title,
+            font=("Segoe UI", 10, "bold"),
+            bg=self.colors["bg"],
+            fg=self.colors["text"],
+        ).grid(row=0, column=column, sticky="w")
+
+        listbox = tk.Listbox(
+            parent,
+            font=("Consolas", 9),
+            relief=tk.FLAT,
+            bg=self.colors["bg_light"],
+            fg=self.colors["text"],
+            selectbackground=self.colors["primary"],
+        )
+        listbox.grid(row=1, column=column, sticky="nsew", padx=(0, 5))
+        return listbox
+
+    def _browse_script(self):
+        filepath = filedialog.askopenfilename(
+            title="Select ASS Script",
+            filetypes=[("ASS Scripts", "*.ass"), ("All Files", "*.*")],
+        )
+        if filepath:
+            self.script_var.set(filepath)
+
+    def _browse_archive(self):
+        filepath = filedialog.askopenfilename(
+            title="Select Fonts Archive",
+            filetypes=[
+                ("Zip Archives", "*.zip"),
+                ("Fonts", "*.ttf *.otf *.ttc"),
+                ("All Files", "*.*"),
+            ],
+        )
+        if filepath:
+            self.archive_var.set(filepath)
+
+    def _check(self):
+        """Compare the script with the archive."""
+        try:
+            missing, unused = check_fonts(
+                self.script_var.get(), [self.archive_var.get()]
+            )
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        self.missing_listbox.delete(0, tk.END)
+        for name, use in missing:
+            self.missing_listbox.insert(tk.END, f"{name}  ({use})")
+        self.unused_listbox.delete(0, tk.END)
+        for filename in unused:
+            self.unused_listbox.insert(tk.END, filename)
+
+        self.status_label.config(
+            text=f"{len(missing)} missing font(s), {len(unused)} unused file(s)",
+            fg=self.colors["accent"] if missing else self.colors["success"],
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ASS font checker")
+    parser.add_argument(
+        "script", nargs="?", help="ASS script (opens the window if none)"
+    )
+    parser.add_argument("archives", nargs="*", help="Fonts .zip files or font files")
+    args = parser.parse_args()
+
+    if not args.script:
+        root = tk.Tk()
+        app = FontCheckerApp(root)
+        root.mainloop()
+        return
+
+    if not args.archives:
+        parser.error("no fonts archive given")
+    try:
+        missing, unused = check_fonts(args.script, args.archives)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        parser.exit(2, f"{e}\n")
+
+    for name, use in missing:
+        print(f"Missing: {name} ({use})")
+    for filename in unused:
+        print(f"Unused: {filename}")
+    print(f"{len(missing)} missing font(s), {len(unused)} unused file(s)")
+    sys.exit(1 if missing else 0)
+
+
+if __name__ == "__main__":
+    main()
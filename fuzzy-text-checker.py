@@ -7,12 +7,868 @@ pip install rapidfuzz
 
 To run:
 python fuzzy-text-checker.py
+python fuzzy-text-checker.py --benchmark terms.txt transcript.txt [--workers 1 2 4 8]
 """
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
+from ass_events import dialogue_lines
+from document_tokenizer import WORD_PATTERN, TokenizedDocument
+from result_export import export_results
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from multiprocessing import shared_memory
+from operator import itemgetter
+import argparse
+import bisect
+import hashlib
+import heapq
+import json
+import math
+import os
 import re
+import sqlite3
+import time
+import unicodedata
+
+
+SCORE_FLOOR = 60
+CLUSTER_RATIO = 85
+RARE_COUNT = 2
+TERMS_INDEX_FORMAT = 2
+TERMS_INDEX_SUFFIX = ".index.json"
+SUPPRESSIONS_FILE = "fuzzy-suppressions.sqlite"
+KNOWN_WORDS_FILE = os.path.join(
+    os.path.expanduser("~"), ".fuzzy-text-checker", "known-words.txt"
+)
+WORDLISTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordlists")
+PARALLEL_MIN_TOKENS = 200_000
+MAX_WORKERS = 8
+SHARDS_PER_WORKER = 4
+PHONETIC_MIN_DELETE = 4
+THRESHOLD_DELAY_MS = 150
+# Above this many changed rows, the list and underlines are rebuilt instead
+LIST_PATCH_LIMIT = 500
+ROMANIZATION_RULES = {
+    # Hepburn spellings folded to Kunrei-shiki
+    "tch": "ty",
+    "shi": "si",
+    "sh": "sy",
+    "chi": "ti",
+    "ch": "ty",
+    "tsu": "tu",
+    "dzu": "zu",
+    "du": "zu",
+    "fu": "hu",
+    "ji": "zi",
+    "j": "zy",
+    "mb": "nb",
+    "mp": "np",
+    "mm": "nm",
+}
+ROMANIZATION_PATTERN = re.compile(
+    "|".join(sorted(ROMANIZATION_RULES, key=len, reverse=True))
+)
+# Long vowels (ou, oh, ei and doubled vowels) and doubled consonants keep
+# only their first letter
+LONG_SOUND_PATTERN = re.compile(r"ou|oh(?![aeiouy])|ei|([a-z])\1")
+EXPORT_FIELDS = ["line", "found", "term", "ratio", "context"]
+EXPORT_FILETYPES = [
+    ("JSON Lines", "*.jsonl"),
+    ("JSON", "*.json"),
+    ("CSV", "*.csv"),
+    ("ASS Comments", "*.ass"),
+]
+
+
+def normalize_for_comparison(text):
+    """Normalize text for comparison."""
+    return text.strip().lower()
+
+
+def phonetic_key(text):
+    """Romanization-insensitive key of a word ("Ryōta", "Ryouta" -> "ryota").
+
+    Strips accents, folds Hepburn spellings to Kunrei-shiki (shi -> si,
+    tsu -> tu, ...) and collapses long vowels and doubled consonants.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    letters = "".join(c for c in decomposed if c.isalnum())
+    folded = ROMANIZATION_PATTERN.sub(lambda m: ROMANIZATION_RULES[m.group()], letters)
+    return LONG_SOUND_PATTERN.sub(lambda m: m.group()[0], folded)
+
+
+def key_variants(key):
+    """The key plus every single-letter deletion (for keys long enough)."""
+    yield key
+    if len(key) >= PHONETIC_MIN_DELETE:
+        for i in range(len(key)):
+            yield key[:i] + key[i + 1 :]
+
+
+def parse_terms(content):
+    """Split the terms pane into unique, stripped terms (in file order)."""
+    return dict.fromkeys(t.strip() for t in content.split("\n") if t.strip())
+
+
+def terms_index_path(terms_file):
+    """Path of the index artifact stored next to a terms file."""
+    return os.path.splitext(terms_file)[0] + TERMS_INDEX_SUFFIX
+
+
+def result_message(result):
+    """Describe a result in one line (used for ASS comments)."""
+    return (
+        f"Possible typo: '{result['found']}' -> '{result['term']}' "
+        f"({result['ratio']:.0f}%)"
+    )
+
+
+def available_wordlists():
+    """List languages with a bundled word list in ``wordlists/<lang>.txt``."""
+    try:
+        names = os.listdir(WORDLISTS_DIR)
+    except OSError:
+        return []
+    return sorted(n[:-4] for n in names if n.endswith(".txt"))
+
+
+def read_word_set(path):
+    """Read a one-word-per-line file into a set of normalized words."""
+    with open(path, "r", encoding="utf-8") as f:
+        return {
+            normalize_for_comparison(line) for line in f if not line.startswith("#")
+        } - {""}
+
+
+def script_lines(content, filepath=None):
+    """Lines to scan in a document: Dialogue text for ASS, else every line."""
+    lines = content.split("\n")
+    if (filepath or "").lower().endswith(".ass") or "[Events]" in content:
+        return list(dialogue_lines(lines))
+    return lines
+
+
+def count_tokens(lines, counts=None):
+    """Count surface-form tokens over lines, adding to ``counts``."""
+    counts = Counter() if counts is None else counts
+    for line in lines:
+        counts.update(WORD_PATTERN.findall(line))
+    return counts
+
+
+def cluster_spellings(
+    token_counts, ratio_threshold=CLUSTER_RATIO, exclude=(), rare_count=RARE_COUNT
+):
+    """Group capitalized or rare tokens that look like the same name.
+
+    Only words sharing a blocking key (first or last two letters) and a
+    compatible length are scored, so the work grows with the block sizes
+    rather than with all pairs. Returns clusters of ``(spelling, count)``
+    lists, most frequent spelling first, largest clusters first.
+    """
+    totals = Counter()
+    surface_forms = defaultdict(Counter)
+    capitalized = set()
+    for token, count in token_counts.items():
+        word_normalized = normalize_for_comparison(token)
+        totals[word_normalized] += count
+        surface_forms[word_normalized][token] += count
+        if token[:1].isupper():
+            capitalized.add(word_normalized)
+
+    words = [
+        w
+        for w, total in totals.items()
+        if len(w) >= 3
+        and not any(c.isdigit() for c in w)
+        and (w in capitalized or total <= rare_count)
+        and w not in exclude
+    ]
+
+    blocks = defaultdict(list)
+    for word in words:
+        blocks["<" + word[:2]].append(word)
+        blocks[word[-2:] + ">"].append(word)
+
+    parent = {word: word for word in words}
+
+    def find(word):
+        while parent[word] != word:
+            parent[word] = parent[parent[word]]
+            word = parent[word]
+        return word
+
+    for block in blocks.values():
+        if len(block) < 2:
+            continue
+        block.sort(key=len)
+        lengths = [len(word) for word in block]
+        for i, word in enumerate(block):
+            # Longer words beyond this length cannot reach the threshold
+            high = len(word) * (200 - ratio_threshold) / ratio_threshold
+            end = bisect.bisect_right(lengths, high + 1e-9)
+            for other, _, _ in process.extract(
+                word,
+                block[i + 1 : end],
+                scorer=fuzz.ratio,
+                score_cutoff=ratio_threshold,
+                limit=None,
+            ):
+                parent[find(other)] = find(word)
+
+    groups = defaultdict(list)
+    for word in words:
+        groups[find(word)].append(word)
+
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        spellings = [
+            (surface_forms[w].most_common(1)[0][0], totals[w]) for w in members
+        ]
+        spellings.sort(key=lambda spelling: -spelling[1])
+        clusters.append(spellings)
+    clusters.sort(key=lambda spellings: -sum(count for _, count in spellings))
+    return clusters
+
+
+class KnownWords:
+    """Allow-list of ordinary words that are never scored against terms.
+
+    Combines the user's own list, which grows through "Add to known words",
+    with an optional bundled word list for the document language.
+    """
+
+    def __init__(self, user_path=KNOWN_WORDS_FILE):
+        self.user_path = user_path
+        self.language = None
+        self.user_words = set()
+        self.bundled_words = frozenset()
+
+    def __contains__(self, word_normalized):
+        return (
+            word_normalized in self.user_words or word_normalized in self.bundled_words
+        )
+
+    def load_user(self):
+        """Load the user allow-list, if it exists."""
+        try:
+            self.user_words = read_word_set(self.user_path)
+        except OSError:
+            self.user_words = set()
+
+    def set_language(self, language):
+        """Switch the bundled word list (None disables it)."""
+        if language == self.language:
+            return
+        self.language = language
+        self.bundled_words = frozenset()
+        if language:
+            path = os.path.join(WORDLISTS_DIR, f"{language}.txt")
+            self.bundled_words = frozenset(read_word_set(path))
+
+    def add(self, word):
+        """Permanently add a word to the user allow-list."""
+        word_normalized = normalize_for_comparison(word)
+        if not word_normalized or word_normalized in self.user_words:
+            return
+        os.makedirs(os.path.dirname(self.user_path), exist_ok=True)
+        with open(self.user_path, "a", encoding="utf-8") as f:
+            f.write(word_normalized + "\n")
+        self.user_words.add(word_normalized)
+
+
+class SuppressionStore:
+    """Resolved (word, term) pairs kept in a SQLite file.
+
+    The file lives in the season workspace (next to the terms file), so the
+    whole team shares it. Pairs are stored normalized, either for every
+    script (``file`` empty) or for a single script name.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=5)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS suppressions ("
+                " word TEXT NOT NULL,"
+                " term TEXT NOT NULL,"
+                " file TEXT NOT NULL DEFAULT '',"
+                " PRIMARY KEY (word, term, file))"
+            )
+
+    @classmethod
+    def for_workspace(cls, directory):
+        """Open the store of a workspace directory (in memory if None)."""
+        if not directory:
+            return cls()
+        return cls(os.path.join(directory, SUPPRESSIONS_FILE))
+
+    def load(self, filename=None):
+        """Return the pairs suppressed globally or for ``filename``."""
+        rows = self.connection.execute(
+            "SELECT word, term FROM suppressions WHERE file = '' OR file = ?",
+            (os.path.basename(filename or ""),),
+        )
+        return set(rows)
+
+    def add(self, word, term, filename=None):
+        """Suppress a pair, optionally only for one script."""
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO suppressions (word, term, file)"
+                " VALUES (?, ?, ?)",
+                (
+                    normalize_for_comparison(word),
+                    normalize_for_comparison(term),
+                    os.path.basename(filename or ""),
+                ),
+            )
+
+    def close(self):
+        self.connection.close()
+
+
+class TermsIndex:
+    """Parsed and normalized terms with a length-bucket search index.
+
+    ``fuzz.ratio`` is ``200 * LCS / (len_a + len_b)``, so for a given word
+    length only terms within a bounded length range can reach a threshold.
+    The buckets let the checker skip every other term without scoring it.
+
+    For romanization-aware checks, terms are also hashed by their phonetic
+    key and its single deletions (built on first use): a word only has to
+    look up its own variants, which finds every term within two edits of
+    its key.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.source = None
+        self.terms = {}
+        self.buckets = {}
+        self.phonetic = None
+
+    def __len__(self):
+        return len(self.terms)
+
+    def update(self, content):
+        """Sync the index with the terms pane, touching only changed terms.
+
+        Content the index was already built from (per its digest) is not
+        parsed again. Returns the ``(added, removed)`` term lists.
+        """
+        source = hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+        if source == self.source:
+            return [], []
+        self.source = source
+
+        parsed = parse_terms(content)
+        removed = [t for t in self.terms if t not in parsed]
+        added = [t for t in parsed if t not in self.terms]
+
+        for term in removed:
+            normalized = self.terms.pop(term)
+            bucket = self.buckets[len(normalized)]
+            del bucket[term]
+            if not bucket:
+                del self.buckets[len(normalized)]
+            if self.phonetic is not None:
+                self._unhash_phonetic(term, normalized)
+
+        for term in added:
+            normalized = normalize_for_comparison(term)
+            self.terms[term] = normalized
+            self.buckets.setdefault(len(normalized), {})[term] = normalized
+            if self.phonetic is not None:
+                self._hash_phonetic(self.phonetic, term, normalized)
+
+        if added or removed:
+            self.version += 1
+        return added, removed
+
+    def candidates(self, word_normalized, ratio_threshold):
+        """Yield ``(term, normalized)`` pairs that can reach the threshold."""
+        length = len(word_normalized)
+        if ratio_threshold <= 0:
+            low, high = 0, math.inf
+        elif ratio_threshold > 100:
+            return
+        else:
+            low = math.ceil(ratio_threshold * length / (200 - ratio_threshold) - 1e-9)
+            high = math.floor(length * (200 - ratio_threshold) / ratio_threshold + 1e-9)
+
+        for term_length, bucket in self.buckets.items():
+            if low <= term_length <= high:
+                yield from bucket.items()
+
+    @staticmethod
+    def _hash_phonetic(phonetic, term, normalized):
+        for variant in set(key_variants(phonetic_key(normalized))):
+            phonetic.setdefault(variant, {})[term] = normalized
+
+    def _unhash_phonetic(self, term, normalized):
+        for variant in set(key_variants(phonetic_key(normalized))):
+            bucket = self.phonetic[variant]
+            del bucket[term]
+            if not bucket:
+                del self.phonetic[variant]
+
+    def phonetic_candidates(self, key):
+        """``{term: normalized}`` of the terms sharing a key variant."""
+        phonetic = self.phonetic
+        if phonetic is None:
+            # Published only once complete, for readers on other threads
+            phonetic = {}
+            for term, normalized in self.terms.items():
+                self._hash_phonetic(phonetic, term, normalized)
+            self.phonetic = phonetic
+
+        candidates = {}
+        for variant in key_variants(key):
+            bucket = phonetic.get(variant)
+            if bucket:
+                candidates.update(bucket)
+        return candidates
+
+    def save(self, path):
+        """Write the index as a versioned JSON artifact."""
+        terms = list(self.terms)
+        positions = {term: i for i, term in enumerate(terms)}
+        data = {
+            "format": TERMS_INDEX_FORMAT,
+            "version": self.version,
+            "source": self.source,
+            "terms": [[term, self.terms[term]] for term in terms],
+            "buckets": {
+                str(length): [positions[term] for term in bucket]
+                for length, bucket in self.buckets.items()
+            },
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved index, or return None if missing, outdated or damaged."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("format") != TERMS_INDEX_FORMAT:
+            return None
+
+        index = cls()
+        try:
+            index.version = int(data["version"])
+            index.source = data["source"]
+            terms = [(term, normalized) for term, normalized in data["terms"]]
+            index.terms = dict(terms)
+            for length, positions in data["buckets"].items():
+                index.buckets[int(length)] = dict(terms[i] for i in positions)
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError):
+            return None
+
+        # Every term must sit once in the bucket of its normalized length
+        if not all(
+            isinstance(term, str) and isinstance(normalized, str)
+            for term, normalized in terms
+        ) or sum(map(len, index.buckets.values())) != len(index.terms):
+            return None
+        for length, bucket in index.buckets.items():
+            if any(len(normalized) != length for normalized in bucket.values()):
+                return None
+        return index
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        """Build an index from ``(term, normalized)`` pairs."""
+        index = cls()
+        for term, normalized in pairs:
+            index.terms[term] = normalized
+            index.buckets.setdefault(len(normalized), {})[term] = normalized
+        return index
+
+
+class SharedTermsTable:
+    """The terms of an index published once in shared memory.
+
+    Worker processes read the table by name instead of receiving the terms
+    with every task. The table keeps the index it was built from, so
+    ``matches`` cannot mistake a new index for it.
+    """
+
+    def __init__(self, terms_index):
+        self.terms_index = terms_index
+        self.version = terms_index.version
+        fields = chain.from_iterable(terms_index.terms.items())
+        data = "\0".join(fields).encode("utf-8")
+        self.size = len(data)
+        self.memory = shared_memory.SharedMemory(create=True, size=max(1, self.size))
+        self.memory.buf[: self.size] = data
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def matches(self, terms_index):
+        return terms_index is self.terms_index and terms_index.version == self.version
+
+    def close(self):
+        self.memory.close()
+        self.memory.unlink()
+
+
+# Terms table attached by this worker process: (shared memory name, index)
+_worker_terms = (None, None)
+
+
+def _attached_terms(name, size):
+    """Index of a SharedTermsTable, read once per worker and table."""
+    global _worker_terms
+    if _worker_terms[0] != name:
+        memory = shared_memory.SharedMemory(name=name)
+        try:
+            fields = bytes(memory.buf[:size]).decode("utf-8").split("\0")
+        finally:
+            memory.close()
+        _worker_terms = (name, TermsIndex.from_pairs(zip(fields[::2], fields[1::2])))
+    return _worker_terms[1]
+
+
+def _score_shard(name, size, words, suppressed_terms, floor, phonetic):
+    """Worker task: score the words first seen in one shard.
+
+    Pairs are sent back as arrays of ratios, word positions in ``words``
+    and term positions in the shared table, which pickle far faster than
+    millions of tuples.
+    """
+    terms_index = _attached_terms(name, size)
+    pairs = ScoreTable.score_words(
+        words, terms_index, suppressed_terms, floor, phonetic
+    )
+    word_positions = {word: i for i, word in enumerate(words)}
+    term_positions = {term: i for i, term in enumerate(terms_index.terms)}
+    return (
+        array("d", map(itemgetter(0), pairs)),
+        array("I", map(word_positions.__getitem__, map(itemgetter(1), pairs))),
+        array("I", map(term_positions.__getitem__, map(itemgetter(2), pairs))),
+    )
+
+
+def shard_words(document, occurrences, shards):
+    """Split words into line-range shards by where they first appear.
+
+    Cuts fall on line boundaries and are placed so every shard holds about
+    the same number of new words, since only those need scoring. Yields
+    word lists in line order.
+    """
+    words = list(occurrences)
+    firsts = [occurrences[word][0] for word in words]
+    starts = document.starts
+    begin = 0
+    for k in range(1, shards + 1):
+        target = len(words) * k // shards
+        if k < shards and target < len(words):
+            line = document.line_of(starts[firsts[target]])
+            first_token = bisect.bisect_left(starts, document.line_starts[line - 1])
+            cut = max(begin, bisect.bisect_left(firsts, first_token))
+        else:
+            cut = len(words)
+        if cut > begin:
+            yield words[begin:cut]
+        begin = cut
+
+
+class ScoreTable:
+    """Best ratio of every unique (word, term) pair found in one scan.
+
+    Each distinct word is scored once, down to ``floor``, no matter how
+    often it appears. Any threshold at or above the floor is then served by
+    filtering this table, so moving the threshold never rescores.
+    """
+
+    def __init__(self, document, floor=SCORE_FLOOR):
+        self.document = document
+        self.floor = floor
+        self.occurrences = {}
+        self.pairs = []
+        self.neg_ratios = []
+        self._hits = {}
+
+    @classmethod
+    def scan(
+        cls,
+        document,
+        terms_index,
+        known_words=(),
+        suppressed=(),
+        floor=SCORE_FLOOR,
+        phonetic=False,
+        executor=None,
+        shared_terms=None,
+        shards=None,
+    ):
+        """Score every unique word of a TokenizedDocument against the terms.
+
+        ``occurrences`` maps each matched word to the indices of its tokens.
+        Suppressed ``(word, term)`` pairs (normalized) are left out of the
+        candidates, so they are never scored. With ``phonetic``, candidates
+        come from the phonetic key buckets and are scored on their keys, so
+        romanization variants of a term score 100.
+
+        Given a process ``executor`` and the terms published as a
+        SharedTermsTable, the document is split into ``shards`` line ranges
+        that are scored in parallel; the result is the same as a serial scan.
+        """
+        suppressed_terms = defaultdict(set)
+        for word_normalized, term_normalized in suppressed:
+            suppressed_terms[word_normalized].add(term_normalized)
+
+        table = cls(document, floor)
+
+        occurrences = {}
+        for i, (_, _, word) in enumerate(document.tokens()):
+            word_normalized = normalize_for_comparison(word)
+            if word_normalized in known_words:
+                continue
+            if word_normalized in occurrences:
+                occurrences[word_normalized].append(i)
+            else:
+                occurrences[word_normalized] = array("I", [i])
+
+        if (
+            executor is None
+            or shared_terms is None
+            or not shared_terms.matches(terms_index)
+        ):
+            pairs = cls.score_words(
+                occurrences, terms_index, suppressed_terms, floor, phonetic
+            )
+        else:
+            # Shards are merged in line order, the order a serial scan uses
+            shard_list = list(
+                shard_words(document, occurrences, shards or SHARDS_PER_WORKER)
+            )
+            futures = [
+                executor.submit(
+                    _score_shard,
+                    shared_terms.name,
+                    shared_terms.size,
+                    words,
+                    {w: suppressed_terms[w] for w in words if w in suppressed_terms},
+                    floor,
+                    phonetic,
+                )
+                for words in shard_list
+            ]
+            terms = list(terms_index.terms)
+            pairs = []
+            for words, future in zip(shard_list, futures):
+                ratios, word_positions, term_positions = future.result()
+                pairs.extend(
+                    zip(
+                        ratios,
+                        map(words.__getitem__, word_positions),
+                        map(terms.__getitem__, term_positions),
+                    )
+                )
+
+        pairs.sort(key=lambda pair: -pair[0])
+        table.pairs = pairs
+        table.neg_ratios = [-ratio for ratio, _, _ in pairs]
+        matched = {word_normalized for _, word_normalized, _ in pairs}
+        table.occurrences = {w: occurrences[w] for w in matched}
+        return table
+
+    @staticmethod
+    def score_words(words, terms_index, suppressed_terms, floor, phonetic=False):
+        """Unsorted ``(ratio, word, term)`` pairs of normalized words."""
+        if phonetic:
+            return ScoreTable._phonetic_pairs(
+                words, terms_index, suppressed_terms, floor
+            )
+
+        # Candidate terms only depend on the word length
+        candidates_by_length = {}
+        pairs = []
+        for word_normalized in words:
+            length = len(word_normalized)
+            if length not in candidates_by_length:
+                candidates = list(terms_index.candidates(word_normalized, floor))
+                candidates_by_length[length] = (
+                    [term for term, _ in candidates],
+                    [normalized for _, normalized in candidates],
+                )
+            terms, normalized_terms = candidates_by_length[length]
+            if word_normalized in suppressed_terms:
+                skip = suppressed_terms[word_normalized]
+                kept = [i for i, n in enumerate(normalized_terms) if n not in skip]
+                terms = [terms[i] for i in kept]
+                normalized_terms = [normalized_terms[i] for i in kept]
+            if not terms:
+                continue
+
+            for term_normalized, ratio, i in process.extract(
+                word_normalized,
+                normalized_terms,
+                scorer=fuzz.ratio,
+                score_cutoff=floor,
+                limit=None,
+            ):
+                if term_normalized != word_normalized:
+                    pairs.append((ratio, word_normalized, terms[i]))
+        return pairs
+
+    @staticmethod
+    def _phonetic_pairs(words, terms_index, suppressed_terms, floor):
+        """Unsorted ``(ratio, word, term)`` pairs scored on phonetic keys."""
+        term_keys = {}
+        pairs = []
+        for word_normalized in words:
+            key = phonetic_key(word_normalized)
+            skip = suppressed_terms.get(word_normalized, ())
+            for term, normalized in terms_index.phonetic_candidates(key).items():
+                if normalized == word_normalized or normalized in skip:
+                    continue
+                if normalized not in term_keys:
+                    term_keys[normalized] = phonetic_key(normalized)
+                ratio = fuzz.ratio(key, term_keys[normalized], score_cutoff=floor)
+                if ratio:
+                    pairs.append((ratio, word_normalized, term))
+        return pairs
+
+    def pair_count(self, threshold):
+        """Number of (word, term) pairs scoring at least ``threshold``."""
+        return bisect.bisect_right(self.neg_ratios, -threshold)
+
+    def results(self, threshold):
+        """Per-hit results for the pairs at or above ``threshold``, in text order."""
+        return self.band(threshold)
+
+    def band(self, low, high=math.inf):
+        """Results of the pairs scoring in ``[low, high)``, in text order.
+
+        Pairs are sorted by ratio, so a band is a slice of the pair table;
+        only its hits are expanded (and cached per pair), never the hits
+        below the lowest threshold asked for.
+        """
+        results = []
+        for ratio, word_normalized, term in self.band_pairs(low, high):
+            results.extend(self.hits(word_normalized, term, ratio))
+        results.sort(key=itemgetter("start"))
+        return results
+
+    def band_pairs(self, low, high=math.inf):
+        """``(ratio, word, term)`` pairs scoring in ``[low, high)``."""
+        return self.pairs[self.pair_count(high) : self.pair_count(low)]
+
+    def hit(self, i, ratio, term):
+        """Result dict of the i-th token scored against a term."""
+        document = self.document
+        text = document.text
+        start, end = document.starts[i], document.ends[i]
+        line_num = document.line_of(start)
+        line_start, line_end = document.line_bounds(line_num)
+        context_start = max(line_start, start - 20)
+        context_end = min(line_end, end + 20)
+        return {
+            "line": line_num,
+            "start": start,
+            "end": end,
+            "term": term,
+            "found": text[start:end],
+            "ratio": ratio,
+            "context": text[context_start:context_end].strip(),
+        }
+
+    def groups(self, threshold):
+        """``(ratio, word, term, count)`` of the pairs at or above ``threshold``.
+
+        Read straight from the pair table, best ratio first, without
+        expanding any hit.
+        """
+        return [
+            (ratio, word_normalized, term, len(self.occurrences[word_normalized]))
+            for ratio, word_normalized, term in self.pairs[: self.pair_count(threshold)]
+        ]
+
+    def hits(self, word_normalized, term, ratio):
+        """Result dicts of one pair's occurrences, in text order."""
+        key = (word_normalized, term)
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = [
+                self.hit(i, ratio, term)
+                for i in self.occurrences.get(word_normalized, ())
+            ]
+            self._hits[key] = hits
+        return hits
+
+    def discard_word(self, word_normalized):
+        """Drop every pair of a word (e.g. once it becomes a known word)."""
+        if self.occurrences.pop(word_normalized, None) is None:
+            return
+        self._drop_hits(word_normalized)
+        self.pairs = [pair for pair in self.pairs if pair[1] != word_normalized]
+        self.neg_ratios = [-ratio for ratio, _, _ in self.pairs]
+
+    def discard_pair(self, word_normalized, term):
+        """Drop one (word, term) pair and its cached hits."""
+        self.pairs = [
+            pair for pair in self.pairs if pair[1] != word_normalized or pair[2] != term
+        ]
+        self.neg_ratios = [-ratio for ratio, _, _ in self.pairs]
+        if not any(pair[1] == word_normalized for pair in self.pairs):
+            self.occurrences.pop(word_normalized, None)
+        self._hits.pop((word_normalized, term), None)
+
+    def _drop_hits(self, word_normalized):
+        for key in [key for key in self._hits if key[0] == word_normalized]:
+            del self._hits[key]
+
+    def apply_correction(self, word_normalized, shift):
+        """Update the table after every occurrence of a word was replaced.
+
+        The document must already hold the corrected text; ``shift`` maps old
+        offsets to new ones. Hits of the corrected word are dropped and the
+        cached hits are moved in place, with contexts refreshed only on the
+        lines that changed.
+        """
+        indices = self.occurrences.pop(word_normalized, ())
+        self._drop_hits(word_normalized)
+        self.pairs = [pair for pair in self.pairs if pair[1] != word_normalized]
+        self.neg_ratios = [-ratio for ratio, _, _ in self.pairs]
+        if not self._hits:
+            return
+
+        document = self.document
+        changed_lines = {document.line_of(document.starts[i]) for i in indices}
+        for hits in self._hits.values():
+            for result in hits:
+                start = result["start"] = shift(result["start"])
+                result["end"] = shift(result["end"])
+                if result["line"] in changed_lines:
+                    line_start, line_end = document.line_bounds(result["line"])
+                    result["context"] = document.text[
+                        max(line_start, start - 20) : min(line_end, result["end"] + 20)
+                    ].strip()
+
+    def histogram(self):
+        """Hit counts per whole ratio, from the floor up to 100."""
+        counts = [0] * (101 - self.floor)
+        for ratio, word_normalized, _ in self.pairs:
+            counts[int(ratio) - self.floor] += len(self.occurrences[word_normalized])
+        return counts
 
 
 class LineNumberText(tk.Text):
@@ -93,9 +949,37 @@ class FuzzyCheckerApp:
         self.terms_modified = False
         self.text_modified = False
         self.results = []
-        self.resolved_items = set()
+        self.visible_results = []
+        self.visible_starts = []
+        self.hit_starts = []
+        self.hit_spans = {}
+        self.current_highlight = None
+        self.current_hit = None
+        self.shown_threshold = None
+        self._threshold_job = None
+        self.suppressions = SuppressionStore()
+        self.resolve_file_only = tk.BooleanVar(value=False)
+        self.phonetic_var = tk.BooleanVar(value=False)
+        self.parallel_var = tk.BooleanVar(value=False)
+        self.group_var = tk.BooleanVar(value=False)
+        self.groups = []
+        self.tree_groups = {}
+        self.tree_hits = {}
+        self.score_table = None
+        self.document = None
+        self.terms_index = TermsIndex()
+        self._terms_refresh_job = None
+        self.terms_index_dirty = False
+        self.known_words = KnownWords()
+        self.known_words.load_user()
+        self.cluster_files = []
+        self.clusters = []
+        self.clusters_window = None
+        self.executor = None
+        self.shared_terms = None
 
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def setup_ui(self):
         """Create the user interface."""
@@ -218,6 +1102,28 @@ class FuzzyCheckerApp:
         )
         self.save_terms_btn.pack(side=tk.LEFT)
 
+        cluster_btn = tk.Button(
+            btn_frame,
+            text="FIND NAMES",
+            font=("Segoe UI", 9, "bold"),
+            bg=self.colors["primary"],
+            fg="white",
+            activebackground=self.colors["primary_dark"],
+            activeforeground="white",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=20,
+            pady=8,
+            command=self._open_clusters_window,
+        )
+        cluster_btn.pack(side=tk.RIGHT)
+        cluster_btn.bind(
+            "<Enter>", lambda e: cluster_btn.config(bg=self.colors["primary_dark"])
+        )
+        cluster_btn.bind(
+            "<Leave>", lambda e: cluster_btn.config(bg=self.colors["primary"])
+        )
+
         # Text area
         text_frame = tk.Frame(terms_card, bg=self.colors["bg"])
         text_frame.grid(row=2, column=0, sticky="nsew", padx=15, pady=(0, 15))
@@ -324,6 +1230,7 @@ class FuzzyCheckerApp:
         self.text_widget = LineNumberText(
             text_container,
             wrap="word",
+            undo=True,
             font=("Consolas", 10),
             relief=tk.FLAT,
             bg=self.colors["bg"],
@@ -335,12 +1242,20 @@ class FuzzyCheckerApp:
         self.text_widget.frame.grid(row=0, column=0, sticky="nsew")
         self.text_widget.bind("<<Modified>>", self._on_text_modified)
 
-        # Highlight tag
+        # Highlight tags: every unresolved hit, and the selected one on top
+        self.text_widget.tag_configure(
+            "hit",
+            underline=True,
+            foreground=self.colors["accent"],
+        )
         self.text_widget.tag_configure(
             "highlight",
             background=self.colors["highlight"],
             foreground=self.colors["accent"],
         )
+        self.text_widget.tag_raise("highlight", "hit")
+        self.root.bind("<F3>", lambda e: self._goto_hit(1))
+        self.root.bind("<Shift-F3>", lambda e: self._goto_hit(-1))
 
     def create_results_section(self, parent):
         """Create the results section."""
@@ -373,42 +1288,113 @@ class FuzzyCheckerApp:
         )
         self.results_count.pack(side=tk.RIGHT)
 
+        tk.Checkbutton(
+            header_frame,
+            text="Group by word",
+            variable=self.group_var,
+            font=("Segoe UI", 9),
+            bg=self.colors["bg"],
+            fg=self.colors["text"],
+            activebackground=self.colors["bg"],
+            command=self._on_group_toggle,
+        ).pack(side=tk.RIGHT, padx=(0, 10))
+
         # Ratio control
         control_frame = tk.Frame(results_card, bg=self.colors["bg"])
         control_frame.grid(row=1, column=0, sticky="ew", padx=15, pady=(0, 10))
 
+        ratio_frame = tk.Frame(control_frame, bg=self.colors["bg"])
+        ratio_frame.pack(fill=tk.X)
+
         ratio_label = tk.Label(
-            control_frame,
+            ratio_frame,
             text="Similarity Ratio:",
             font=("Segoe UI", 9),
             bg=self.colors["bg"],
             fg=self.colors["text"],
         )
-        ratio_label.pack(side=tk.LEFT, padx=(0, 5))
+        ratio_label.pack(side=tk.LEFT, padx=(0, 5), anchor="s")
+
+        self.ratio_var = tk.IntVar(value=80)
+        ratio_scale = tk.Scale(
+            ratio_frame,
+            variable=self.ratio_var,
+            from_=SCORE_FLOOR,
+            to=100,
+            orient=tk.HORIZONTAL,
+            length=120,
+            font=("Segoe UI", 8),
+            relief=tk.FLAT,
+            highlightthickness=0,
+            bg=self.colors["bg"],
+            fg=self.colors["text"],
+            troughcolor=self.colors["bg_light"],
+            command=self._on_threshold_change,
+        )
+        ratio_scale.pack(side=tk.LEFT)
 
-        self.ratio_var = tk.StringVar(value="80")
-        ratio_entry = tk.Entry(
-            control_frame,
-            textvariable=self.ratio_var,
-            width=5,
+        tk.Label(
+            ratio_frame,
+            text="%",
             font=("Segoe UI", 9),
-            relief=tk.FLAT,
+            bg=self.colors["bg"],
+            fg=self.colors["text"],
+        ).pack(side=tk.LEFT, anchor="s")
+
+        self.histogram_canvas = tk.Canvas(
+            control_frame,
+            height=40,
             bg=self.colors["bg_light"],
+            highlightthickness=0,
+        )
+        self.histogram_canvas.pack(fill=tk.X, pady=(5, 0))
+        self.histogram_canvas.bind("<Configure>", lambda e: self._draw_histogram())
+
+        tk.Checkbutton(
+            control_frame,
+            text="Romanization-aware (Ryouta = Ryōta = Ryota)",
+            variable=self.phonetic_var,
+            font=("Segoe UI", 9),
+            bg=self.colors["bg"],
             fg=self.colors["text"],
+            activebackground=self.colors["bg"],
+        ).pack(anchor="w", pady=(5, 0))
+
+        tk.Checkbutton(
+            control_frame,
+            text="Score huge documents on several processes",
+            variable=self.parallel_var,
+            font=("Segoe UI", 9),
+            bg=self.colors["bg"],
+            fg=self.colors["text"],
+            activebackground=self.colors["bg"],
+        ).pack(anchor="w")
+
+        self.wordlist_var = tk.StringVar(value="None")
+        wordlist_combo = ttk.Combobox(
+            ratio_frame,
+            textvariable=self.wordlist_var,
+            values=["None"] + available_wordlists(),
+            state="readonly",
+            width=7,
+            font=("Segoe UI", 9),
         )
-        ratio_entry.pack(side=tk.LEFT, padx=(0, 5))
+        wordlist_combo.pack(side=tk.RIGHT, anchor="s")
 
         tk.Label(
-            control_frame,
-            text="%",
+            ratio_frame,
+            text="Word list:",
             font=("Segoe UI", 9),
             bg=self.colors["bg"],
             fg=self.colors["text"],
-        ).pack(side=tk.LEFT)
+        ).pack(side=tk.RIGHT, padx=(10, 5), anchor="s")
+
+        # Action buttons
+        action_frame = tk.Frame(results_card, bg=self.colors["bg"])
+        action_frame.grid(row=2, column=0, padx=15, pady=(0, 10))
 
-        # Check button
         check_btn = tk.Button(
-            results_card,
+            action_frame,
             text="ANALYZE TEXT",
             font=("Segoe UI", 10, "bold"),
             bg=self.colors["accent"],
@@ -421,10 +1407,32 @@ class FuzzyCheckerApp:
             pady=10,
             command=self._check_text,
         )
-        check_btn.grid(row=2, column=0, padx=15, pady=(0, 10))
+        check_btn.pack(side=tk.LEFT, padx=(0, 5))
         check_btn.bind("<Enter>", lambda e: check_btn.config(bg="#E64A19"))
         check_btn.bind("<Leave>", lambda e: check_btn.config(bg=self.colors["accent"]))
 
+        export_btn = tk.Button(
+            action_frame,
+            text="EXPORT",
+            font=("Segoe UI", 10, "bold"),
+            bg=self.colors["primary"],
+            fg="white",
+            activebackground=self.colors["primary_dark"],
+            activeforeground="white",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=20,
+            pady=10,
+            command=self._export_results,
+        )
+        export_btn.pack(side=tk.LEFT)
+        export_btn.bind(
+            "<Enter>", lambda e: export_btn.config(bg=self.colors["primary_dark"])
+        )
+        export_btn.bind(
+            "<Leave>", lambda e: export_btn.config(bg=self.colors["primary"])
+        )
+
         # Results list
         list_frame = tk.Frame(results_card, bg=self.colors["bg"])
         list_frame.grid(row=3, column=0, sticky="nsew", padx=15, pady=(0, 10))
@@ -452,10 +1460,36 @@ class FuzzyCheckerApp:
         scrollbar_y.config(command=self.results_listbox.yview)
         scrollbar_x.config(command=self.results_listbox.xview)
         self.results_listbox.bind("<<ListboxSelect>>", self._on_result_select)
+        self.results_scrollbars = (scrollbar_y, scrollbar_x)
+
+        # Grouped view: one row per (word, term) pair, hits loaded on expand
+        ttk.Style().configure(
+            "Results.Treeview",
+            font=("Consolas", 9),
+            background=self.colors["bg_light"],
+            fieldbackground=self.colors["bg_light"],
+        )
+        self.results_tree = ttk.Treeview(
+            list_frame,
+            columns=("count", "ratio"),
+            style="Results.Treeview",
+            yscrollcommand=scrollbar_y.set,
+            xscrollcommand=scrollbar_x.set,
+        )
+        self.results_tree.heading("#0", text="Word → Term")
+        self.results_tree.heading("count", text="Hits")
+        self.results_tree.heading("ratio", text="Ratio")
+        self.results_tree.column("count", width=50, anchor="e", stretch=False)
+        self.results_tree.column("ratio", width=50, anchor="e", stretch=False)
+        self.results_tree.bind("<<TreeviewOpen>>", self._on_group_open)
+        self.results_tree.bind("<<TreeviewSelect>>", self._on_result_select)
+
+        # Resolve buttons
+        resolve_frame = tk.Frame(results_card, bg=self.colors["bg"])
+        resolve_frame.grid(row=4, column=0, padx=15, pady=(0, 5))
 
-        # Resolve button
         resolve_btn = tk.Button(
-            results_card,
+            resolve_frame,
             text="MARK AS RESOLVED",
             font=("Segoe UI", 9, "bold"),
             bg=self.colors["success"],
@@ -468,12 +1502,63 @@ class FuzzyCheckerApp:
             pady=8,
             command=self._mark_resolved,
         )
-        resolve_btn.grid(row=4, column=0, padx=15, pady=(0, 15))
+        resolve_btn.pack(side=tk.LEFT, padx=(0, 5))
         resolve_btn.bind("<Enter>", lambda e: resolve_btn.config(bg="#45a049"))
         resolve_btn.bind(
             "<Leave>", lambda e: resolve_btn.config(bg=self.colors["success"])
         )
 
+        known_btn = tk.Button(
+            resolve_frame,
+            text="ADD TO KNOWN WORDS",
+            font=("Segoe UI", 9, "bold"),
+            bg=self.colors["primary"],
+            fg="white",
+            activebackground=self.colors["primary_dark"],
+            activeforeground="white",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=20,
+            pady=8,
+            command=self._add_known_word,
+        )
+        known_btn.pack(side=tk.LEFT)
+        known_btn.bind(
+            "<Enter>", lambda e: known_btn.config(bg=self.colors["primary_dark"])
+        )
+        known_btn.bind("<Leave>", lambda e: known_btn.config(bg=self.colors["primary"]))
+
+        fix_frame = tk.Frame(results_card, bg=self.colors["bg"])
+        fix_frame.grid(row=5, column=0, padx=15, pady=(0, 15))
+
+        tk.Checkbutton(
+            fix_frame,
+            text="Resolve for this file only",
+            variable=self.resolve_file_only,
+            font=("Segoe UI", 9),
+            bg=self.colors["bg"],
+            fg=self.colors["text"],
+            activebackground=self.colors["bg"],
+        ).pack(side=tk.LEFT, padx=(0, 10))
+
+        fix_btn = tk.Button(
+            fix_frame,
+            text="FIX ALL OCCURRENCES",
+            font=("Segoe UI", 9, "bold"),
+            bg=self.colors["accent"],
+            fg="white",
+            activebackground="#E64A19",
+            activeforeground="white",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=20,
+            pady=8,
+            command=self._apply_correction,
+        )
+        fix_btn.pack(side=tk.LEFT)
+        fix_btn.bind("<Enter>", lambda e: fix_btn.config(bg="#E64A19"))
+        fix_btn.bind("<Leave>", lambda e: fix_btn.config(bg=self.colors["accent"]))
+
     def _load_terms(self):
         """Load terms from file."""
         filepath = filedialog.askopenfilename(
@@ -487,6 +1572,14 @@ class FuzzyCheckerApp:
             self.terms_text.delete("1.0", tk.END)
             self.terms_text.insert("1.0", content)
             self.terms_text.edit_modified(False)
+            self._cancel_terms_refresh()
+            self.terms_index_dirty = False
+            self.terms_index = (
+                TermsIndex.load(terms_index_path(filepath)) or TermsIndex()
+            )
+            added, removed = self.terms_index.update(content)
+            if added or removed:
+                self._save_terms_index()
             self.terms_modified = False
             self.save_terms_btn["state"] = "disabled"
             self.terms_status.config(fg=self.colors["success"])
@@ -497,6 +1590,8 @@ class FuzzyCheckerApp:
             content = self.terms_text.get("1.0", "end-1c")
             with open(self.terms_file, "w", encoding="utf-8") as f:
                 f.write(content)
+            self._refresh_terms_index()
+            self._save_terms_index()
             self.terms_text.edit_modified(False)
             self.terms_modified = False
             self.save_terms_btn["state"] = "disabled"
@@ -507,7 +1602,11 @@ class FuzzyCheckerApp:
         """Load text from file."""
         filepath = filedialog.askopenfilename(
             title="Select Text File",
-            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")],
+            filetypes=[
+                ("Text Files", "*.txt"),
+                ("ASS Scripts", "*.ass"),
+                ("All Files", "*.*"),
+            ],
         )
         if filepath:
             self.text_file = filepath
@@ -516,6 +1615,7 @@ class FuzzyCheckerApp:
             self.text_widget.delete("1.0", tk.END)
             self.text_widget.insert("1.0", content)
             self.text_widget.edit_modified(False)
+            self.text_widget.edit_reset()
             self.text_modified = False
             self.save_text_btn["state"] = "disabled"
             self.text_status.config(fg=self.colors["success"])
@@ -527,6 +1627,7 @@ class FuzzyCheckerApp:
             with open(self.text_file, "w", encoding="utf-8") as f:
                 f.write(content)
             self.text_widget.edit_modified(False)
+            self.text_widget.edit_reset()
             self.text_modified = False
             self.save_text_btn["state"] = "disabled"
             self.text_status.config(fg=self.colors["success"])
@@ -539,6 +1640,9 @@ class FuzzyCheckerApp:
             self.save_terms_btn["state"] = "normal"
             self.terms_status.config(fg=self.colors["warning"])
             self.terms_text.edit_modified(False)
+            self.terms_index_dirty = True
+            self._cancel_terms_refresh()
+            self._terms_refresh_job = self.root.after(300, self._refresh_terms_index)
 
     def _on_text_modified(self, event=None):
         """Handle text modification."""
@@ -548,22 +1652,45 @@ class FuzzyCheckerApp:
             self.text_status.config(fg=self.colors["warning"])
             self.text_widget.edit_modified(False)
 
+    def _cancel_terms_refresh(self):
+        """Cancel a pending terms index refresh."""
+        if self._terms_refresh_job is not None:
+            self.root.after_cancel(self._terms_refresh_job)
+            self._terms_refresh_job = None
+
+    def _refresh_terms_index(self):
+        """Apply terms pane edits to the index incrementally, if there are any."""
+        self._cancel_terms_refresh()
+        if not self.terms_index_dirty:
+            return
+        self.terms_index_dirty = False
+        self.terms_index.update(self.terms_text.get("1.0", "end-1c"))
+
+    def _save_terms_index(self):
+        """Persist the terms index next to the terms file."""
+        if self.terms_file:
+            try:
+                self.terms_index.save(terms_index_path(self.terms_file))
+            except OSError:
+                pass
+
     def _normalize_for_comparison(self, text):
         """Normalize text for comparison."""
-        return text.strip().lower()
+        return normalize_for_comparison(text)
 
     def _check_text(self):
         """Check text for potential typos."""
+        wordlist = self.wordlist_var.get()
         try:
-            ratio_threshold = float(self.ratio_var.get())
-        except ValueError:
-            messagebox.showerror("Error", "Invalid ratio value")
+            self.known_words.set_language(None if wordlist == "None" else wordlist)
+        except OSError:
+            messagebox.showerror("Error", f"Could not read word list '{wordlist}'")
             return
 
-        terms_content = self.terms_text.get("1.0", "end-1c")
+        self._refresh_terms_index()
         text_content = self.text_widget.get("1.0", "end-1c")
 
-        if not terms_content.strip():
+        if not self.terms_index:
             messagebox.showwarning("Warning", "Terms list is empty")
             return
 
@@ -571,104 +1698,863 @@ class FuzzyCheckerApp:
             messagebox.showwarning("Warning", "Text is empty")
             return
 
-        terms = [t.strip() for t in terms_content.split("\n") if t.strip()]
-        lines = text_content.split("\n")
-
-        self.results = []
-        self.resolved_items = set()
-
-        for line_num, line in enumerate(lines, 1):
-            words_in_line = re.finditer(r"\b[\w\-]+\b", line)
-
-            for match in words_in_line:
-                word = match.group()
-                word_normalized = self._normalize_for_comparison(word)
-
-                for term in terms:
-                    term_normalized = self._normalize_for_comparison(term)
+        self._open_suppressions()
+        self.document = TokenizedDocument(text_content)
+        executor, shared_terms = self._scan_pool(len(self.document))
+        self.score_table = ScoreTable.scan(
+            self.document,
+            self.terms_index,
+            self.known_words,
+            self.suppressions.load(self.text_file),
+            phonetic=self.phonetic_var.get(),
+            executor=executor,
+            shared_terms=shared_terms,
+            shards=SHARDS_PER_WORKER * MAX_WORKERS,
+        )
+        self._apply_threshold()
 
-                    if word_normalized == term_normalized:
-                        continue
+        if not self.score_table.pair_count(self.ratio_var.get()):
+            messagebox.showinfo("Results", "No potential typos found! ✓")
 
-                    ratio = fuzz.ratio(word_normalized, term_normalized)
+    def _scan_pool(self, token_count):
+        """Process pool and shared terms for big documents, else ``(None, None)``.
+
+        The pool is opt-in: on few cores, starting it costs more than it saves.
+        """
+        workers = min(MAX_WORKERS, os.cpu_count() or 1)
+        if (
+            not self.parallel_var.get()
+            or token_count < PARALLEL_MIN_TOKENS
+            or workers < 2
+        ):
+            return None, None
+
+        if self.executor is None:
+            try:
+                self.executor = ProcessPoolExecutor(max_workers=workers)
+            except (OSError, NotImplementedError):
+                return None, None
+        if self.shared_terms is None or not self.shared_terms.matches(self.terms_index):
+            if self.shared_terms is not None:
+                self.shared_terms.close()
+            self.shared_terms = SharedTermsTable(self.terms_index)
+        return self.executor, self.shared_terms
+
+    def _on_close(self):
+        """Stop the scoring workers and close the window."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.shared_terms is not None:
+            self.shared_terms.close()
+        self.suppressions.close()
+        self.root.destroy()
+
+    def _on_threshold_change(self, value=None):
+        """Re-filter the cached scores once the slider settles."""
+        if self.score_table is None:
+            return
+        if self._threshold_job is not None:
+            self.root.after_cancel(self._threshold_job)
+        self._threshold_job = self.root.after(
+            THRESHOLD_DELAY_MS, self._update_threshold
+        )
 
-                    if ratio >= ratio_threshold:
-                        context_start = max(0, match.start() - 20)
-                        context_end = min(len(line), match.end() + 20)
-                        context = line[context_start:context_end].strip()
+    def _update_threshold(self):
+        """Show or hide only the hits between the shown and the new threshold."""
+        self._threshold_job = None
+        threshold = self.ratio_var.get()
+        shown = self.shown_threshold
+        if self.score_table is None or shown is None or threshold == shown:
+            return
 
-                        self.results.append(
-                            {
-                                "line": line_num,
-                                "term": term,
-                                "found": word,
-                                "ratio": ratio,
-                                "context": context,
-                            }
-                        )
+        self._clear_current_highlight()
+        if self.group_var.get():
+            band = self.score_table.band_pairs(
+                min(threshold, shown), max(threshold, shown)
+            )
+            spans = list(self._pair_spans(band))
+            self.groups = self.score_table.groups(threshold)
+            self._update_results_tree()
+        elif threshold < shown:
+            added = self.score_table.band(threshold, shown)
+            self._insert_result_rows(added)
+            spans = [(result["start"], result["end"]) for result in added]
+        else:
+            removed = self._delete_result_rows(threshold)
+            spans = [(result["start"], result["end"]) for result in removed]
+
+        if threshold < shown:
+            self._tag_spans(spans)
+        else:
+            self._untag_spans(spans)
+        self.shown_threshold = threshold
+        self._update_results_count()
+        self._draw_histogram()
+
+    def _apply_threshold(self):
+        """Rebuild the results from the score table for the current threshold."""
+        threshold = self.ratio_var.get()
+        if self.group_var.get():
+            self.groups = self.score_table.groups(threshold)
+            self.results = []
+            self._update_results_tree()
+        else:
+            self.results = self.score_table.results(threshold)
+            self._update_results_list()
+        self.shown_threshold = threshold
+        self._highlight_hits()
+        self._draw_histogram()
+
+    def _draw_histogram(self):
+        """Draw hit counts per threshold (hits at or above each ratio)."""
+        canvas = self.histogram_canvas
+        canvas.delete("all")
+        if self.score_table is None:
+            return
 
-        self._update_results_list()
+        counts = self.score_table.histogram()
+        cumulative = []
+        total = 0
+        for count in reversed(counts):
+            total += count
+            cumulative.append(total)
+        cumulative.reverse()
+        if not total:
+            return
 
-        if not self.results:
-            messagebox.showinfo("Results", "No potential typos found! ✓")
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        bar_width = width / len(cumulative)
+        threshold = self.ratio_var.get()
+        for i, count in enumerate(cumulative):
+            bar_height = max(1, (height - 2) * count / total) if count else 0
+            color = (
+                self.colors["primary"]
+                if SCORE_FLOOR + i >= threshold
+                else self.colors["border"]
+            )
+            canvas.create_rectangle(
+                i * bar_width,
+                height - bar_height,
+                (i + 1) * bar_width - 1,
+                height,
+                fill=color,
+                width=0,
+            )
 
     def _update_results_list(self):
         """Update the results listbox."""
         self.results_listbox.delete(0, tk.END)
 
-        visible_count = 0
-        for idx, result in enumerate(self.results):
-            if idx not in self.resolved_items:
-                display = f"L{result['line']}: '{result['found']}' → '{result['term']}' ({result['ratio']:.0f}%)"
-                self.results_listbox.insert(tk.END, display)
-                visible_count += 1
+        self.visible_results = self.results
+        self.visible_starts = [result["start"] for result in self.visible_results]
+        self.results_listbox.insert(
+            tk.END, *map(self._result_row, self.visible_results)
+        )
+
+        self._update_results_count()
+
+    @staticmethod
+    def _result_row(result):
+        """Listbox text of a result."""
+        return (
+            f"L{result['line']}: '{result['found']}' → '{result['term']}'"
+            f" ({result['ratio']:.0f}%)"
+        )
 
+    def _insert_result_rows(self, results):
+        """Merge results (in text order) into the list, patching few rows."""
+        if len(results) > LIST_PATCH_LIMIT:
+            self.results = list(
+                heapq.merge(self.visible_results, results, key=itemgetter("start"))
+            )
+            self._update_results_list()
+            return
+
+        for result in results:
+            row = bisect.bisect_right(self.visible_starts, result["start"])
+            self.visible_starts.insert(row, result["start"])
+            self.visible_results.insert(row, result)
+            self.results_listbox.insert(row, self._result_row(result))
+
+    def _delete_result_rows(self, threshold):
+        """Drop the rows scoring below ``threshold``; returns their results."""
+        rows = [
+            row
+            for row, result in enumerate(self.visible_results)
+            if result["ratio"] < threshold
+        ]
+        return self._delete_rows(rows)
+
+    def _delete_rows(self, rows):
+        """Delete list rows, rebuilding the list if many; returns their results."""
+        removed = [self.visible_results[row] for row in rows]
+        if len(rows) > LIST_PATCH_LIMIT:
+            dropped = set(rows)
+            self.results = [
+                result
+                for row, result in enumerate(self.visible_results)
+                if row not in dropped
+            ]
+            self._update_results_list()
+            return removed
+
+        for row in reversed(rows):
+            del self.visible_results[row]
+            del self.visible_starts[row]
+            self.results_listbox.delete(row)
+        return removed
+
+    def _update_results_tree(self):
+        """Fill the grouped view with one collapsed row per pair."""
+        tree = self.results_tree
+        tree.delete(*tree.get_children())
+        self.tree_groups = {}
+        self.tree_hits = {}
+        self.visible_results = []
+        self.visible_starts = []
+
+        occurrences = self.score_table.occurrences
+        for row, (ratio, word_normalized, term, count) in enumerate(self.groups):
+            found = self.document.token(occurrences[word_normalized][0])
+            iid = tree.insert(
+                "",
+                tk.END,
+                iid=f"g{row}",
+                text=f"'{found}' → '{term}'",
+                values=(count, f"{ratio:.0f}%"),
+            )
+            self.tree_groups[iid] = self.groups[row]
+            # Placeholder child, replaced by the hits when the row is opened
+            tree.insert(iid, tk.END, iid=f"{iid}.", text="…")
+
+        self._update_results_count()
+
+    def _on_group_open(self, event=None):
+        """Load the hits of a pair the first time its row is expanded."""
+        iid = self.results_tree.focus()
+        if not self.results_tree.exists(f"{iid}."):
+            return
+        self.results_tree.delete(f"{iid}.")
+
+        ratio, word_normalized, term, _ = self.tree_groups[iid]
+        for k, hit in enumerate(self.score_table.hits(word_normalized, term, ratio)):
+            child = self.results_tree.insert(
+                iid, tk.END, iid=f"{iid}.{k}", text=self._hit_row(hit)
+            )
+            self.tree_hits[child] = hit
+
+    @staticmethod
+    def _hit_row(hit):
+        """Grouped view text of one hit."""
+        return f"L{hit['line']}: {hit['context']}"
+
+    def _on_group_toggle(self):
+        """Switch between the flat list and the grouped view."""
+        scrollbar_y, scrollbar_x = self.results_scrollbars
+        if self.group_var.get():
+            self.results_listbox.grid_remove()
+            self.results_tree.grid(row=0, column=0, sticky="nsew")
+            view = self.results_tree
+        else:
+            self.results_tree.grid_remove()
+            self.results_listbox.grid(row=0, column=0, sticky="nsew")
+            view = self.results_listbox
+        scrollbar_y.config(command=view.yview)
+        scrollbar_x.config(command=view.xview)
+
+        if self.score_table is not None:
+            self._apply_threshold()
+
+    def _update_results_count(self):
+        """Update the issue counter."""
+        if self.group_var.get():
+            pair_count = len(self.groups)
+            visible_count = sum(count for _, _, _, count in self.groups)
+            self.results_count.config(
+                text=f"{pair_count} word{'s' if pair_count != 1 else ''} · "
+                f"{visible_count} issue{'s' if visible_count != 1 else ''}"
+            )
+            return
+        visible_count = len(self.visible_results)
         self.results_count.config(
             text=f"{visible_count} issue{'s' if visible_count != 1 else ''}"
         )
 
+    def _highlight_hits(self):
+        """Underline every unresolved hit with a single batched tag call."""
+        self.text_widget.tag_remove("hit", "1.0", tk.END)
+        self._clear_current_highlight()
+        self.hit_spans = {}
+        self.hit_starts = []
+        self._tag_spans(self._visible_spans())
+
+    def _tag_spans(self, spans):
+        """Underline spans; one span can match several terms, so rows are counted."""
+        tk_index = self.document.tk_index
+        ranges = []
+        for start, end in spans:
+            span = self.hit_spans.get(start)
+            if span is None:
+                self.hit_spans[start] = [end, 1]
+                ranges.append(tk_index(start))
+                ranges.append(tk_index(end))
+            else:
+                span[1] += 1
+
+        if ranges:
+            self.hit_starts = sorted(self.hit_spans)
+            self.text_widget.tag_add("hit", *ranges)
+
+    def _untag_spans(self, spans):
+        """Drop one row from each span, removing the underlines no row needs."""
+        removed = []
+        for start, end in spans:
+            span = self.hit_spans[start]
+            span[1] -= 1
+            if not span[1]:
+                del self.hit_spans[start]
+                removed.append((start, end))
+        if not removed:
+            return
+
+        self.hit_starts = sorted(self.hit_spans)
+        tk_index = self.document.tk_index
+        if len(removed) > LIST_PATCH_LIMIT:
+            self.text_widget.tag_remove("hit", "1.0", tk.END)
+            ranges = []
+            for start in self.hit_starts:
+                ranges.append(tk_index(start))
+                ranges.append(tk_index(self.hit_spans[start][0]))
+            if ranges:
+                self.text_widget.tag_add("hit", *ranges)
+            return
+        for start, end in removed:
+            self.text_widget.tag_remove("hit", tk_index(start), tk_index(end))
+
+    def _shift_hit_spans(self, shift, dropped):
+        """Move the underline bookkeeping past an edit, forgetting ``dropped``.
+
+        The text widget moves the tags itself, and the replaced spans lost
+        theirs with their text.
+        """
+        self.hit_spans = {
+            shift(start): [shift(span[0]), span[1]]
+            for start, span in self.hit_spans.items()
+            if start not in dropped
+        }
+        self.hit_starts = sorted(self.hit_spans)
+
+    def _visible_spans(self):
+        """Yield ``(start, end)`` of every visible hit, in either view."""
+        if self.group_var.get():
+            return self._pair_spans(self.groups)
+        return ((result["start"], result["end"]) for result in self.visible_results)
+
+    def _pair_spans(self, pairs):
+        """Yield ``(start, end)`` of the hits of ``(ratio, word, term, ...)`` rows."""
+        starts, ends = self.document.starts, self.document.ends
+        occurrences = self.score_table.occurrences
+        for pair in pairs:
+            for i in occurrences[pair[1]]:
+                yield starts[i], ends[i]
+
+    def _clear_current_highlight(self):
+        """Remove the selected-hit highlight, touching only its own range."""
+        if self.current_highlight is not None:
+            self.text_widget.tag_remove("highlight", *self.current_highlight)
+            self.current_highlight = None
+        self.current_hit = None
+
+    def _goto_hit(self, direction):
+        """Jump to the next (1) or previous (-1) hit, wrapping around."""
+        if not self.hit_starts:
+            return "break"
+
+        # Step from the highlighted hit; the cursor only seeds the first jump
+        grouped = self.group_var.get()
+        result = None if grouped else self._selected_result()
+        if result is not None:
+            offset = result["start"]
+        elif self.current_hit is not None:
+            offset = self.current_hit
+        else:
+            line, col = map(int, self.text_widget.index(tk.INSERT).split("."))
+            line = min(line, self.document.line_count)
+            offset = self.document.line_starts[line - 1] + col - direction
+
+        if direction > 0:
+            i = bisect.bisect_right(self.hit_starts, offset)
+            start = self.hit_starts[i % len(self.hit_starts)]
+        else:
+            i = bisect.bisect_left(self.hit_starts, offset) - 1
+            start = self.hit_starts[i]
+
+        if grouped:
+            self._show_span(start, self.hit_spans[start][0])
+            return "break"
+
+        row = bisect.bisect_left(self.visible_starts, start)
+        self.results_listbox.selection_clear(0, tk.END)
+        self.results_listbox.selection_set(row)
+        self.results_listbox.see(row)
+        self._on_result_select()
+        return "break"
+
+    def _selected_result(self):
+        """Return the selected result (a pair's first hit in the grouped view)."""
+        if self.group_var.get():
+            selection = self.results_tree.selection()
+            if not selection or self.score_table is None:
+                return None
+            iid = selection[0]
+            if iid in self.tree_hits:
+                return self.tree_hits[iid]
+            ratio, word_normalized, term, _ = self.tree_groups[iid.split(".")[0]]
+            first = self.score_table.occurrences[word_normalized][0]
+            return self.score_table.hit(first, ratio, term)
+
+        selection = self.results_listbox.curselection()
+        if selection and selection[0] < len(self.visible_results):
+            return self.visible_results[selection[0]]
+        return None
+
+    def _export_results(self):
+        """Export unresolved results to JSONL, CSV or ASS comments."""
+        results = self.visible_results
+        if self.group_var.get() and self.score_table is not None:
+            results = self.score_table.results(self.ratio_var.get())
+        if not results:
+            messagebox.showwarning("Warning", "No results to export")
+            return
+
+        filepath = filedialog.asksaveasfilename(
+            title="Export Results",
+            defaultextension=".jsonl",
+            filetypes=EXPORT_FILETYPES,
+        )
+        if not filepath:
+            return
+
+        source_lines = self.text_widget.get("1.0", "end-1c").split("\n")
+        try:
+            count = export_results(
+                iter(results),
+                filepath,
+                EXPORT_FIELDS,
+                source_lines,
+                result_message,
+            )
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Export failed: {e}")
+            return
+
+        messagebox.showinfo("Success", f"Exported {count} result(s)")
+
     def _on_result_select(self, event=None):
         """Handle result selection."""
-        selection = self.results_listbox.curselection()
-        if selection:
-            visible_idx = selection[0]
-
-            actual_idx = 0
-            for idx, result in enumerate(self.results):
-                if idx not in self.resolved_items:
-                    if actual_idx == visible_idx:
-                        actual_idx = idx
-                        break
-                    actual_idx += 1
-
-            if actual_idx < len(self.results):
-                result = self.results[actual_idx]
-                line_num = result["line"]
-                self.text_widget.see(f"{line_num}.0")
-                self.text_widget.tag_remove("highlight", "1.0", tk.END)
-                self.text_widget.tag_add(
-                    "highlight", f"{line_num}.0", f"{line_num}.end"
-                )
+        result = self._selected_result()
+        if result is not None:
+            self._show_span(result["start"], result["end"])
+
+    def _show_span(self, start, end):
+        """Highlight a span of the document and scroll to it."""
+        self._clear_current_highlight()
+        self.current_hit = start
+        start = self.document.tk_index(start)
+        end = self.document.tk_index(end)
+        self.text_widget.tag_add("highlight", start, end)
+        self.text_widget.mark_set(tk.INSERT, start)
+        self.text_widget.see(start)
+        self.current_highlight = (start, end)
+
+    def _open_suppressions(self):
+        """Open the suppression store of the current workspace."""
+        workspace = os.path.dirname(self.terms_file or self.text_file or "")
+        path = os.path.join(workspace, SUPPRESSIONS_FILE) if workspace else ":memory:"
+        if self.suppressions.path == path:
+            return
+        try:
+            store = SuppressionStore.for_workspace(workspace)
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Could not open {path}: {e}")
+            return
+        self.suppressions.close()
+        self.suppressions = store
 
     def _mark_resolved(self):
-        """Mark selected result as resolved."""
-        selection = self.results_listbox.curselection()
-        if selection:
-            visible_idx = selection[0]
-
-            actual_idx = 0
-            for idx, result in enumerate(self.results):
-                if idx not in self.resolved_items:
-                    if actual_idx == visible_idx:
-                        actual_idx = idx
-                        break
-                    actual_idx += 1
-
-            self.resolved_items.add(actual_idx)
-            self._update_results_list()
+        """Suppress the selected (word, term) pair, now and in later scans."""
+        result = self._selected_result()
+        if result is None:
+            return
+
+        word_normalized = self._normalize_for_comparison(result["found"])
+        term = result["term"]
+        self._open_suppressions()
+        try:
+            self.suppressions.add(
+                word_normalized,
+                term,
+                self.text_file if self.resolve_file_only.get() else None,
+            )
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Could not save resolution: {e}")
+            return
+
+        self._discard_rows(word_normalized, term)
+
+    def _discard_rows(self, word_normalized, term=None):
+        """Drop a word's pairs (or one pair) from the table and its result rows.
+
+        Only the rows of those pairs and the underlines no other row needs
+        are removed, in either view.
+        """
+        if self.group_var.get():
+            groups = self._delete_group_rows(word_normalized, term)
+            spans = list(self._pair_spans(groups))
+        if term is None:
+            self.score_table.discard_word(word_normalized)
+        else:
+            self.score_table.discard_pair(word_normalized, term)
+
+        if self.group_var.get():
+            self._untag_spans(spans)
+            self._clear_current_highlight()
+            self._update_results_count()
+            self._draw_histogram()
+            return
+        rows = [
+            row
+            for row, r in enumerate(self.visible_results)
+            if term in (None, r["term"])
+            and self._normalize_for_comparison(r["found"]) == word_normalized
+        ]
+        self._remove_result_rows(rows)
+
+    def _delete_group_rows(self, word_normalized, term=None):
+        """Delete the grouped rows of a word's pairs (or one pair); returns them."""
+        tree = self.results_tree
+        removed = []
+        for iid, group in list(self.tree_groups.items()):
+            if group[1] != word_normalized or term not in (None, group[2]):
+                continue
+            for child in tree.get_children(iid):
+                self.tree_hits.pop(child, None)
+            tree.delete(iid)
+            del self.tree_groups[iid]
+            removed.append(group)
+        if removed:
+            self.groups = [group for group in self.groups if group not in removed]
+        return removed
+
+    def _remove_result_rows(self, rows):
+        """Delete result rows and only the underlines no other row needs."""
+        row = rows[0] if rows else 0
+        removed = self._delete_rows(rows)
+        self._untag_spans((result["start"], result["end"]) for result in removed)
+        self._clear_current_highlight()
+        self._update_results_count()
+        self._draw_histogram()
+
+        if self.visible_results:
+            row = min(row, len(self.visible_results) - 1)
+            self.results_listbox.selection_set(row)
+            self._on_result_select()
+
+    def _apply_correction(self):
+        """Replace every occurrence of the selected word with its term.
+
+        All replacements form a single undoable edit, applied back-to-front
+        so the recorded spans stay valid, and the results are updated in
+        place instead of rescanning.
+        """
+        result = self._selected_result()
+        if result is None:
+            return
+
+        if self.text_widget.get("1.0", "end-1c") != self.document.text:
+            messagebox.showwarning(
+                "Warning", "The text changed since the analysis; analyze it again"
+            )
+            return
+
+        document = self.document
+        word_normalized = self._normalize_for_comparison(result["found"])
+        term = result["term"]
+        spans = [
+            (document.starts[i], document.ends[i])
+            for i in self.score_table.occurrences[word_normalized]
+        ]
+
+        widget = self.text_widget
+        tk_index = document.tk_index
+        widget.config(autoseparators=False)
+        widget.edit_separator()
+        try:
+            for start, end in reversed(spans):
+                widget.replace(tk_index(start), tk_index(end), term)
+        finally:
+            widget.edit_separator()
+            widget.config(autoseparators=True)
+
+        # Only the corrected word's rows go; the other hits are shifted in place
+        if self.group_var.get():
+            self._delete_group_rows(word_normalized)
+        else:
+            self._delete_rows(
+                [
+                    row
+                    for row, r in enumerate(self.visible_results)
+                    if self._normalize_for_comparison(r["found"]) == word_normalized
+                ]
+            )
+        shift = document.replace_spans(spans, term)
+        self.score_table.apply_correction(word_normalized, shift)
+        self._shift_hit_spans(shift, {start for start, _ in spans})
+        self.visible_starts = [result["start"] for result in self.visible_results]
+
+        # Contexts were refreshed on the edited lines; so are their open rows
+        changed_lines = {document.line_of(shift(start)) for start, _ in spans}
+        for child, hit in self.tree_hits.items():
+            if hit["line"] in changed_lines:
+                self.results_tree.item(child, text=self._hit_row(hit))
+
+        self._clear_current_highlight()
+        self._update_results_count()
+        self._draw_histogram()
+        self.results_count.config(
+            text=f"{len(spans)} fixed · {self.results_count.cget('text')}"
+        )
+
+    def _add_known_word(self):
+        """Add the selected result's word to the known-words allow-list."""
+        result = self._selected_result()
+        if result is not None:
+            word = result["found"]
+            try:
+                self.known_words.add(word)
+            except OSError as e:
+                messagebox.showerror("Error", f"Could not save known word: {e}")
+                return
+
+            self._discard_rows(self._normalize_for_comparison(word))
+
+    def _open_clusters_window(self):
+        """Open the name-spelling clusters window."""
+        if self.clusters_window is not None and self.clusters_window.winfo_exists():
+            self.clusters_window.lift()
+            self._refresh_clusters()
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("Name Spellings")
+        window.geometry("600x450")
+        window.configure(bg=self.colors["bg"])
+        window.grid_rowconfigure(1, weight=1)
+        window.grid_columnconfigure(0, weight=1)
+        self.clusters_window = window
+
+        header_frame = tk.Frame(window, bg=self.colors["bg"])
+        header_frame.grid(row=0, column=0, sticky="ew", padx=15, pady=(15, 5))
+
+        self.clusters_label = tk.Label(
+            header_frame,
+            text="Similar spellings",
+            font=("Segoe UI", 11, "bold"),
+            bg=self.colors["bg"],
+            fg=self.colors["text"],
+        )
+        self.clusters_label.pack(side=tk.LEFT)
+
+        list_frame = tk.Frame(window, bg=self.colors["bg"])
+        list_frame.grid(row=1, column=0, sticky="nsew", padx=15, pady=(0, 10))
+        list_frame.grid_rowconfigure(0, weight=1)
+        list_frame.grid_columnconfigure(0, weight=1)
+
+        scrollbar = tk.Scrollbar(list_frame)
+        scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.clusters_listbox = tk.Listbox(
+            list_frame,
+            font=("Consolas", 9),
+            bg=self.colors["bg_light"],
+            fg=self.colors["text"],
+            relief=tk.FLAT,
+            selectbackground=self.colors["primary"],
+            selectforeground="white",
+            yscrollcommand=scrollbar.set,
+        )
+        self.clusters_listbox.grid(row=0, column=0, sticky="nsew")
+        scrollbar.config(command=self.clusters_listbox.yview)
+
+        btn_frame = tk.Frame(window, bg=self.colors["bg"])
+        btn_frame.grid(row=2, column=0, padx=15, pady=(0, 15))
+
+        add_files_btn = tk.Button(
+            btn_frame,
+            text="ADD SCRIPTS",
+            font=("Segoe UI", 9, "bold"),
+            bg=self.colors["primary"],
+            fg="white",
+            activebackground=self.colors["primary_dark"],
+            activeforeground="white",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=20,
+            pady=8,
+            command=self._add_cluster_files,
+        )
+        add_files_btn.pack(side=tk.LEFT, padx=(0, 5))
+
+        add_term_btn = tk.Button(
+            btn_frame,
+            text="ADD TO GLOSSARY",
+            font=("Segoe UI", 9, "bold"),
+            bg=self.colors["success"],
+            fg="white",
+            activebackground="#45a049",
+            activeforeground="white",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=20,
+            pady=8,
+            command=self._add_cluster_term,
+        )
+        add_term_btn.pack(side=tk.LEFT)
+
+        self._refresh_clusters()
+
+    def _add_cluster_files(self):
+        """Add more scripts to the clustering corpus."""
+        filepaths = filedialog.askopenfilenames(
+            title="Select Scripts",
+            filetypes=[
+                ("ASS Scripts", "*.ass"),
+                ("Text Files", "*.txt"),
+                ("All Files", "*.*"),
+            ],
+            parent=self.clusters_window,
+        )
+        for filepath in filepaths:
+            if filepath not in self.cluster_files:
+                self.cluster_files.append(filepath)
+        if filepaths:
+            self._refresh_clusters()
+
+    def _refresh_clusters(self):
+        """Cluster the current document plus any added scripts."""
+        counts = count_tokens(
+            script_lines(self.text_widget.get("1.0", "end-1c"), self.text_file)
+        )
+        for filepath in self.cluster_files:
+            if filepath == self.text_file:
+                continue
+            try:
+                with open(filepath, "r", encoding="utf-8-sig") as f:
+                    count_tokens(script_lines(f.read(), filepath), counts)
+            except (OSError, UnicodeDecodeError) as e:
+                messagebox.showerror(
+                    "Error",
+                    f"Could not read {filepath}: {e}",
+                    parent=self.clusters_window,
+                )
+
+        self._refresh_terms_index()
+        exclude = set(self.terms_index.terms.values()) | self.known_words.user_words
+        self.clusters = cluster_spellings(counts, exclude=exclude)
+
+        self.clusters_listbox.delete(0, tk.END)
+        self.clusters_listbox.insert(
+            tk.END,
+            *(
+                " · ".join(f"{spelling} ({count})" for spelling, count in spellings)
+                for spellings in self.clusters
+            ),
+        )
+        scripts = 1 + len([f for f in self.cluster_files if f != self.text_file])
+        self.clusters_label.config(
+            text=f"{len(self.clusters)} spelling cluster"
+            f"{'s' if len(self.clusters) != 1 else ''} in {scripts} script"
+            f"{'s' if scripts != 1 else ''}"
+        )
+
+    def _add_cluster_term(self):
+        """Append the dominant spelling of the selected cluster to the terms."""
+        selection = self.clusters_listbox.curselection()
+        if not selection:
+            return
+        spelling = self.clusters[selection[0]][0][0]
+
+        content = self.terms_text.get("1.0", "end-1c")
+        if content and not content.endswith("\n"):
+            self.terms_text.insert(tk.END, "\n")
+        self.terms_text.insert(tk.END, spelling)
+        self.terms_index_dirty = True
+        self._refresh_terms_index()
+
+        self.clusters_listbox.delete(selection[0])
+        del self.clusters[selection[0]]
+
+
+def benchmark_scan(terms_path, document_path, worker_counts, floor=SCORE_FLOOR):
+    """Time a serial scan and sharded scans of one document.
+
+    Yields ``(workers, seconds)``, with 0 workers for the serial scan.
+    """
+    with open(terms_path, "r", encoding="utf-8") as f:
+        terms_index = TermsIndex()
+        terms_index.update(f.read())
+    with open(document_path, "r", encoding="utf-8-sig") as f:
+        document = TokenizedDocument(f.read())
+
+    start = time.perf_counter()
+    expected = ScoreTable.scan(document, terms_index, floor=floor).pairs
+    yield 0, time.perf_counter() - start
+
+    shared_terms = SharedTermsTable(terms_index)
+    try:
+        for workers in worker_counts:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Start the workers before timing
+                list(executor.map(abs, range(workers)))
+                start = time.perf_counter()
+                table = ScoreTable.scan(
+                    document,
+                    terms_index,
+                    floor=floor,
+                    executor=executor,
+                    shared_terms=shared_terms,
+                    shards=workers * SHARDS_PER_WORKER,
+                )
+                elapsed = time.perf_counter() - start
+            if table.pairs != expected:
+                raise RuntimeError(f"Sharded scan with {workers} workers differs")
+            yield workers, elapsed
+    finally:
+        shared_terms.close()
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Fuzzy Text Checker")
+    parser.add_argument(
+        "--benchmark",
+        nargs=2,
+        metavar=("TERMS", "DOCUMENT"),
+        help="Measure sharded scan scaling instead of opening the window",
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    if args.benchmark:
+        serial = None
+        for workers, seconds in benchmark_scan(*args.benchmark, args.workers):
+            if not workers:
+                serial = seconds
+                print(f"serial: {seconds:.2f} s")
+            else:
+                print(f"{workers} workers: {seconds:.2f} s ({serial / seconds:.2f}x)")
+        return
+
     root = tk.Tk()
     app = FuzzyCheckerApp(root)
     root.mainloop()
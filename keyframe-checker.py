@@ -0,0 +1,467 @@
+"""
+Keyframe Checker
+Flags subtitle events that start or end just off a scene change.
+
+Reads the SCXvid keyframe logs written by keyframes-generator (or Aegisub
+"keyframe format v1" files) and compares them with the event times of an
+ASS script: a start or end a few frames away from a keyframe, but not on
+it, is almost always a timing slip.
+
+To run:
+python keyframe-checker.py
+python keyframe-checker.py ep01.ass ep02.ass [--fps 24000/1001] [--frames 5]
+"""
+
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from ass_events import format_timestamp, parse_timestamp, plain_text, read_events
+from result_export import export_results
+from array import array
+from fractions import Fraction
+import argparse
+import bisect
+import os
+import time
+
+
+DEFAULT_FPS = "24000/1001"
+KEYFRAME_DISTANCE = 5
+KEYFRAMES_SUFFIX = "_keyframes.log"
+FRAME_TYPES = "ipbs"
+EXPORT_FIELDS = ["line", "boundary", "time", "frame", "keyframe", "distance", "text"]
+EXPORT_FILETYPES = [
+    ("JSON Lines", "*.jsonl"),
+    ("JSON", "*.json"),
+    ("CSV", "*.csv"),
+    ("ASS Comments", "*.ass"),
+]
+
+
+def parse_fps(value):
+    """Parse a frame rate such as "24000/1001", "23.976" or "25"."""
+    try:
+        fps = Fraction(value.strip())
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"Invalid frame rate: '{value}'")
+    if fps <= 0:
+        raise ValueError(f"Invalid frame rate: '{value}'")
+    # Decimal NTSC rates (23.976, 29.97, ...) stand for n * 1000 / 1001
+    ntsc = round(fps * Fraction(1001, 1000))
+    if fps.denominator != 1 and abs(fps * Fraction(1001, 1000) - ntsc) < 0.01:
+        return Fraction(ntsc * 1000, 1001)
+    return fps
+
+
+def read_keyframes(lines):
+    """Read a keyframe log into a sorted array of frame numbers.
+
+    Supports SCXvid/XviD pass logs (one line per frame, "i" for keyframes)
+    and "# keyframe format v1" files (one frame number per line).
+    """
+    lines = iter(lines)
+    header = next(lines, "").lstrip("\ufeff").strip().lower()
+    keyframes = array("I")
+
+    if header.startswith("# keyframe format v1"):
+        for line in lines:
+            line = line.strip()
+            if line.isdigit():
+                keyframes.append(int(line))
+        return array("I", sorted(keyframes))
+
+    if not header.startswith("# xvid"):
+        raise ValueError("Unknown keyframe log format")
+
+    frame = 0
+    for line in lines:
+        kind = line[:1].lower()
+        if not kind or kind not in FRAME_TYPES:
+            continue
+        if kind == "i":
+            keyframes.append(frame)
+        frame += 1
+    return keyframes
+
+
+def load_keyframes(path):
+    """Read a keyframe log file."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return read_keyframes(f)
+
+
+def keyframes_path(script_path):
+    """Log written by keyframes.bat for the video a script is named after."""
+    return os.path.splitext(script_path)[0] + KEYFRAMES_SUFFIX
+
+
+def check_events(events, keyframes, fps, max_distance=KEYFRAME_DISTANCE):
+    """Yield a result for every event boundary close to, but off, a keyframe.
+
+    A boundary is the first frame shown (start) or the first frame no longer
+    shown (end), so an end "on" a keyframe leaves the line right as the
+    scene changes. Each boundary is a binary search in ``keyframes``.
+    """
+    # Frame of a time: the first frame starting at or after it
+    numerator, denominator = fps.numerator, fps.denominator * 1000
+    count = len(keyframes)
+
+    for entry in events:
+        if entry.kind != "Dialogue":
+            continue
+        for boundary in ("Start", "End"):
+            try:
+                ms = parse_timestamp(entry.fields.get(boundary, ""))
+            except ValueError:
+                break
+            frame = -(-ms * numerator // denominator)
+
+            i = bisect.bisect_left(keyframes, frame)
+            if i < count and keyframes[i] == frame:
+                continue
+            nearest = min(
+                (keyframes[j] for j in (i - 1, i) if 0 <= j < count),
+                key=lambda keyframe: abs(keyframe - frame),
+                default=None,
+            )
+            if nearest is None or abs(nearest - frame) > max_distance:
+                continue
+            yield {
+                "line": entry.line,
+                "boundary": boundary.lower(),
+                "time": format_timestamp(ms),
+                "frame": frame,
+                "keyframe": nearest,
+                "distance": nearest - frame,
+                "text": " ".join(plain_text(entry.fields.get("Text", "")).split()),
+            }
+
+
+def check_script(script_path, keyframes, fps, max_distance=KEYFRAME_DISTANCE):
+    """List the results of one script against a keyframe array."""
+    with open(script_path, "r", encoding="utf-8-sig") as f:
+        return list(check_events(read_events(f), keyframes, fps, max_distance))
+
+
+def read_lines(path):
+    """Lines of a script, read up front so it can be exported onto itself."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        return f.readlines()
+
+
+def result_message(result):
+    """Describe a result in one line (used for ASS comments)."""
+    frames = abs(result["distance"])
+    side = "before" if result["distance"] > 0 else "after"
+    return (
+        f"{result['boundary'].capitalize()} {frames} frame{'s' if frames != 1 else ''}"
+        f" {side} keyframe {result['keyframe']}"
+    )
+
+
+class KeyframeCheckerApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Keyframe Checker")
+        self.root.geometry("900x600")
+
+        self.colors = {
+            "primary": "#2196F3",
+            "primary_dark": "#1976D2",
+            "accent": "#FF5722",
+            "success": "#4CAF50",
+            "text": "#212121",
+            "text_secondary": "#757575",
+            "bg": "#FFFFFF",
+            "bg_light": "#f5f5f5",
+        }
+
+        self.results = []
+        self.script_var = tk.StringVar()
+        self.keyframes_var = tk.StringVar()
+        self.fps_var = tk.StringVar(value=DEFAULT_FPS)
+        self.frames_var = tk.IntVar(value=KEYFRAME_DISTANCE)
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Create the user interface."""
+        self.root.configure(bg=self.colors["bg_light"])
+
+        header_frame = tk.Frame(self.root, bg=self.colors["primary"], height=80)
+        header_frame.pack(fill=tk.X)
+        header_frame.pack_propagate(False)
+
+        tk.Label(
+            header_frame,
+            text="🎬 Keyframe Checker",
+            font=("Segoe UI", 20, "bold"),
+            bg=self.colors["primary"],
+            fg="white",
+        ).pack(side=tk.LEFT, pady=20, padx=20)
+
+        tk.Label(
+            header_frame,
+            text="Find event times that just miss a scene change",
+            font=("Segoe UI", 10),
+            bg=self.colors["primary"],
+            fg="white",
+        ).pack(side=tk.LEFT, pady=20)
+
+        main_frame = tk.Frame(self.root, bg=self.colors["bg"])
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        main_frame.grid_columnconfigure(1, weight=1)
+        main_frame.grid_rowconfigure(4, weight=1)
+
+        for row, (label, variable, command) in enumerate(
+            (
+                ("Script:", self.script_var, self._browse_script),
+                ("Keyframes:", self.keyframes_var, self._browse_keyframes),
+            )
+        ):
+            tk.Label(
+                main_frame,
+                text=label,
+                font=("Segoe UI", 9),
+                bg=self.colors["bg"],
+                fg=self.colors["text"],
+            ).grid(row=row, column=0, sticky="w", padx=(15, 5), pady=(15, 0))
+            tk.Entry(main_frame, textvariable=variable, font=("Segoe UI", 9)).grid(
+                row=row, column=1, sticky="ew", pady=(15, 0)
+            )
+            tk.Button(
+                main_frame,
+                text="BROWSE",
+                font=("Segoe UI", 9, "bold"),
+                bg=self.colors["primary"],
+                fg="white",
+                activebackground=self.colors["primary_dark"],
+                activeforeground="white",
+                relief=tk.FLAT,
+                cursor="hand2",
+                padx=10,
+                command=command,
+            ).grid(row=row, column=2, padx=15, pady=(15, 0))
+
+        options_frame = tk.Frame(main_frame, bg=self.colors["bg"])
+        options_frame.grid(row=2, column=0, columnspan=3, sticky="ew", padx=15, pady=15)
+
+        tk.Label(
+            options_frame,
+            text="FPS:",
+            font=("Segoe UI", 9),
+            bg=self.colors["bg"],
+            fg=self.colors["text"],
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Combobox(
+            options_frame,
+            textvariable=self.fps_var,
+            values=["24000/1001", "24", "25", "30000/1001", "60000/1001"],
+            width=11,
+            font=("Segoe UI", 9),
+        ).pack(side=tk.LEFT)
+
+        tk.Label(
+            options_frame,
+            text="Max distance (frames):",
+            font=("Segoe UI", 9),
+            bg=self.colors["bg"],
+            fg=self.colors["text"],
+        ).pack(side=tk.LEFT, padx=(15, 5))
+        tk.Spinbox(
+            options_frame,
+            from_=1,
+            to=48,
+            textvariable=self.frames_var,
+            width=4,
+            font=("Segoe UI", 9),
+        ).pack(side=tk.LEFT)
+
+        export_btn = tk.Button(
+            options_frame,
+            text="EXPORT",
+            font=("Segoe UI", 10, "bold"),
+            bg=self.colors["primary"],
+            fg="white",
+            activebackground=self.colors["primary_dark"],
+            activeforeground="white",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=20,
+            command=self._export_results,
+        )
+        export_btn.pack(side=tk.RIGHT)
+
+        check_btn = tk.Button(
+            options_frame,
+            text="CHECK TIMING",
+            font=("Segoe UI", 10, "bold"),
+            bg=self.colors["accent"],
+            fg="white",
+            activebackground="#E64A19",
+            activeforeground="white",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=20,
+            command=self._check,
+        )
+        check_btn.pack(side=tk.RIGHT, padx=5)
+
+        self.status_label = tk.Label(
+            main_frame,
+            text="",
+            font=("Segoe UI", 9),
+            bg=self.colors["bg"],
+            fg=self.colors["text_secondary"],
+        )
+        self.status_label.grid(row=3, column=0, columnspan=3, sticky="w", padx=15)
+
+        list_frame = tk.Frame(main_frame, bg=self.colors["bg"])
+        list_frame.grid(
+            row=4, column=0, columnspan=3, sticky="nsew", padx=15, pady=(5, 15)
+        )
+        list_frame.grid_rowconfigure(0, weight=1)
+        list_frame.grid_columnconfigure(0, weight=1)
+
+        self.results_listbox = tk.Listbox(
+            list_frame,
+            font=("Consolas", 9),
+            relief=tk.FLAT,
+            bg=self.colors["bg_light"],
+            fg=self.colors["text"],
+            selectbackground=self.colors["primary"],
+        )
+        self.results_listbox.grid(row=0, column=0, sticky="nsew")
+        scrollbar = ttk.Scrollbar(
+            list_frame, orient=tk.VERTICAL, command=self.results_listbox.yview
+        )
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.results_listbox.configure(yscrollcommand=scrollbar.set)
+
+    def _browse_script(self):
+        """Pick a script and guess its keyframe log."""
+        filepath = filedialog.askopenfilename(
+            title="Select ASS Script",
+            filetypes=[("ASS Scripts", "*.ass"), ("All Files", "*.*")],
+        )
+        if not filepath:
+            return
+        self.script_var.set(filepath)
+        if os.path.exists(keyframes_path(filepath)):
+            self.keyframes_var.set(keyframes_path(filepath))
+
+    def _browse_keyframes(self):
+        filepath = filedialog.askopenfilename(
+            title="Select Keyframe Log",
+            filetypes=[("Keyframe Logs", "*.log *.txt"), ("All Files", "*.*")],
+        )
+        if filepath:
+            self.keyframes_var.set(filepath)
+
+    def _check(self):
+        """Check the selected script against its keyframes."""
+        try:
+            fps = parse_fps(self.fps_var.get())
+            max_distance = self.frames_var.get()
+            keyframes = load_keyframes(self.keyframes_var.get())
+            self.results = check_script(
+                self.script_var.get(), keyframes, fps, max_distance
+            )
+        except (OSError, ValueError, tk.TclError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        self.results_listbox.delete(0, tk.END)
+        for result in self.results:
+            self.results_listbox.insert(
+                tk.END,
+                f"L{result['line']} {result['time']}: {result_message(result)}"
+                f" — {result['text'][:60]}",
+            )
+        self.status_label.config(
+            text=f"{len(self.results)} issue(s), {len(keyframes)} keyframes"
+        )
+
+    def _export_results(self):
+        """Export the results to JSONL, CSV or ASS comments."""
+        if not self.results:
+            messagebox.showwarning("Warning", "No results to export")
+            return
+
+        filepath = filedialog.asksaveasfilename(
+            title="Export Results",
+            defaultextension=".jsonl",
+            filetypes=EXPORT_FILETYPES,
+        )
+        if not filepath:
+            return
+
+        try:
+            count = export_results(
+                iter(self.results),
+                filepath,
+                EXPORT_FIELDS,
+                read_lines(self.script_var.get()),
+                result_message,
+            )
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Export failed: {e}")
+            return
+
+        messagebox.showinfo("Success", f"Exported {count} result(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyframe timing checker")
+    parser.add_argument(
+        "scripts", nargs="*", help="ASS scripts (opens the window if none)"
+    )
+    parser.add_argument(
+        "--keyframes",
+        help=f"Keyframe log (default: <script>{KEYFRAMES_SUFFIX}, one script only)",
+    )
+    parser.add_argument("--fps", default=DEFAULT_FPS)
+    parser.add_argument("--frames", type=int, default=KEYFRAME_DISTANCE)
+    parser.add_argument("--export", help="Export results (one script only)")
+    args = parser.parse_args()
+
+    if not args.scripts:
+        root = tk.Tk()
+        app = KeyframeCheckerApp(root)
+        root.mainloop()
+        return
+
+    if len(args.scripts) > 1 and (args.keyframes or args.export):
+        parser.error("--keyframes and --export need a single script")
+    fps = parse_fps(args.fps)
+
+    start = time.perf_counter()
+    total = 0
+    for script_path in args.scripts:
+        log_path = args.keyframes or keyframes_path(script_path)
+        try:
+            keyframes = load_keyframes(log_path)
+            results = check_script(script_path, keyframes, fps, args.frames)
+        except (OSError, ValueError) as e:
+            print(f"{script_path}: {e}")
+            continue
+        for result in results:
+            print(
+                f"{script_path}:{result['line']}: {result['time']} "
+                f"{result_message(result)}"
+            )
+        if args.export:
+            export_results(
+                iter(results),
+                args.export,
+                EXPORT_FIELDS,
+                read_lines(script_path),
+                result_message,
+            )
+        total += len(results)
+
+    elapsed = time.perf_counter() - start
+    print(f"{total} issue(s) in {len(args.scripts)} script(s), {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
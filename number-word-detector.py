@@ -10,9 +10,239 @@ python number-word-detector.py
 """
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog, messagebox
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
 import re
 from num2words import num2words
+from array import array
+from document_tokenizer import TokenizedDocument
+from result_export import export_results
+
+
+LOADING_SUFFIX = ' (loading…)'
+EXPORT_FIELDS = ['line', 'start', 'end', 'text', 'lang', 'kind', 'value']
+EXPORT_FILETYPES = [
+    ('JSON Lines', '*.jsonl'),
+    ('JSON', '*.json'),
+    ('CSV', '*.csv'),
+    ('ASS Comments', '*.ass')
+]
+
+
+# Trie keys: hyphenated compounds ("forty-two", "three-year-old") are split
+# into their words, so a number inside a compound token is still found
+SUBWORD_PATTERN = re.compile(r'\w+')
+CONNECTORS = {'and', 'e', 'de', 'a', 'o', 'the', 'of'}
+LARGE_NUMBERS = [1000, 10000, 100000, 1000000, 1000000000]
+
+# Fractions are named after ordinals, except where a language has its own word
+FRACTION_DENOMINATORS = list(range(2, 11)) + [100, 1000]
+FRACTION_NAMES = {
+    'en': {2: ['half'], 4: ['quarter', 'fourth']},
+    'pt_BR': {2: ['meio', 'meia'], 3: ['terço']}
+}
+IRREGULAR_PLURALS = {'half': 'halves'}
+# Rule-based feminine cardinals (um -> uma, dois -> duas, duzentos -> duzentas)
+FEMININE_CARDINALS = {
+    'pt_BR': [(re.compile(r'\bum\b'), 'uma'), (re.compile(r'\bdois\b'), 'duas'), (re.compile(r'entos\b'), 'entas')]
+}
+MASCULINE_NOUNS = re.compile(r'\b(?:milhão|milhões|bilhão|bilhões)\b')
+# Languages whose ordinals agree in gender and number (primeiro, primeiras)
+GENDERED_ORDINALS = {'pt_BR'}
+
+
+SAMPLE_TEXTS = {
+    'en': "I bought three apples and five oranges at the market. The event gathered one thousand people and lasted two hours. Zero problems, one hundred solutions! There were three hundred and forty-two registrants.",
+    'pt_BR': "Comprei três maçãs e cinco laranjas no mercado. O evento reuniu mil pessoas e durou duas horas. Zero problemas, cem soluções! Foram trezentos e quarenta e dois inscritos."
+}
+
+
+def plural(word):
+    """Plural of a fraction name (third -> thirds, terço -> terços)."""
+    return IRREGULAR_PLURALS.get(word, word + 's')
+
+
+def build_number_words(lang_code, max_num=1000):
+    """Map number phrases to ``(kind, value)`` (None for bare fragments).
+    
+    Kinds are 'cardinal', 'ordinal' and 'fraction' (valued "n/d"). Gendered
+    and plural forms, and the thousands, are derived from the num2words
+    output by rules, so each number costs one cardinal and one ordinal call.
+    """
+    words = {}
+    
+    def add(phrase, kind, value):
+        if words.get(phrase) is None:
+            words[phrase] = (kind, value)
+        # Add individual words from compound numbers
+        for word in re.findall(r'\b\w+\b', phrase):
+            words.setdefault(word, None)
+    
+    def spell(value, to='cardinal'):
+        try:
+            return num2words(value, lang=lang_code, to=to).lower()
+        except Exception:
+            return None
+    
+    # Generate numbers from 0 to max_num, then specific large numbers
+    cardinals = {}
+    for i in list(range(max_num + 1)) + LARGE_NUMBERS:
+        cardinals[i] = spell(i)
+    
+    # Thousands reuse the multiplier's spelling ("dois mil", "two thousand"),
+    # so they also get its feminine form below ("duas mil")
+    two_thousand = spell(2000)
+    if cardinals.get(2) and two_thousand and two_thousand.startswith(cardinals[2] + ' '):
+        thousand = two_thousand[len(cardinals[2]):]
+        for i in range(2, min(max_num, 999) + 1):
+            if cardinals[i] is not None and i * 1000 not in cardinals:
+                cardinals[i * 1000] = cardinals[i] + thousand
+    ordinals = {i: spell(i, 'ordinal') for i in range(1, max_num + 1)}
+    for i in FRACTION_DENOMINATORS:
+        if i not in ordinals:
+            ordinals[i] = spell(i, 'ordinal')
+    
+    feminine = FEMININE_CARDINALS.get(lang_code, [])
+    for value, phrase in cardinals.items():
+        if phrase is None:
+            continue
+        add(phrase, 'cardinal', value)
+        if feminine and not MASCULINE_NOUNS.search(phrase):
+            for pattern, replacement in feminine:
+                phrase = pattern.sub(replacement, phrase)
+            add(phrase, 'cardinal', value)
+    
+    for value, phrase in ordinals.items():
+        if phrase is None or value > max_num:
+            continue
+        add(phrase, 'ordinal', value)
+        if lang_code in GENDERED_ORDINALS:
+            feminine_phrase = re.sub(r'o\b', 'a', phrase)
+            add(feminine_phrase, 'ordinal', value)
+            add(re.sub(r'\b(\w+)\b', r'\1s', phrase), 'ordinal', value)
+            add(re.sub(r'\b(\w+)\b', r'\1s', feminine_phrase), 'ordinal', value)
+    
+    for denominator in FRACTION_DENOMINATORS:
+        names = FRACTION_NAMES.get(lang_code, {}).get(denominator)
+        if names is None:
+            if ordinals.get(denominator) is None:
+                continue
+            names = [ordinals[denominator]]
+        else:
+            # A bare "half" or "terço" is always a fraction
+            for name in names:
+                add(name, 'fraction', f'1/{denominator}')
+        for name in names:
+            add(f'{cardinals[1]} {name}', 'fraction', f'1/{denominator}')
+            for numerator in range(2, min(denominator, 10)):
+                add(f'{cardinals[numerator]} {plural(name)}', 'fraction', f'{numerator}/{denominator}')
+    
+    # Remove common connectors
+    for connector in CONNECTORS:
+        if words.get(connector) is None:
+            words.pop(connector, None)
+    
+    return words
+
+
+class NumberMatcher:
+    """Word-level trie merging the number phrases of several languages.
+    
+    Every terminal node maps language codes to ``(kind, value)``, so a
+    single scan over the text tokens finds occurrences for all enabled
+    languages at once; adding a language only adds nodes, not another pass.
+    """
+    
+    def __init__(self):
+        self.root = {}
+        self.values = {}
+    
+    def add_language(self, lang_code, words):
+        """Merge a language's phrase -> (kind, value) dictionary into the trie."""
+        self.values[lang_code] = words
+        for phrase, entry in words.items():
+            node = self.root
+            for token in SUBWORD_PATTERN.findall(phrase):
+                node = node.setdefault(token, {})
+            node.setdefault(None, {})[lang_code] = entry
+    
+    def find(self, document, langs=None):
+        """Find the longest number phrases in a TokenizedDocument."""
+        text = document.text
+        tokens = []
+        starts = array('I')
+        ends = array('I')
+        for start, end, token in document.tokens():
+            if '-' not in token:
+                tokens.append(token.lower())
+                starts.append(start)
+                ends.append(end)
+                continue
+            for match in SUBWORD_PATTERN.finditer(token):
+                tokens.append(match.group().lower())
+                starts.append(start + match.start())
+                ends.append(start + match.end())
+        langs = set(self.values if langs is None else langs)
+        occurrences = []
+        
+        i = 0
+        while i < len(tokens):
+            node = self.root
+            best = None
+            j = i
+            while j < len(tokens):
+                # Phrase words may only be separated by whitespace or a hyphen
+                if j > i:
+                    separator = text[ends[j - 1]:starts[j]].strip()
+                    if separator and separator != '-':
+                        break
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                outputs = node.get(None)
+                if outputs and not langs.isdisjoint(outputs):
+                    best = (j, outputs)
+                j += 1
+            
+            if best is None:
+                i += 1
+                continue
+            
+            j, outputs = best
+            start, end = starts[i], ends[j]
+            occurrences.append({
+                'text': text[start:end],
+                'start': start,
+                'end': end,
+                'values': {l: e and e[1] for l, e in outputs.items() if l in langs},
+                'kinds': {l: e and e[0] for l, e in outputs.items() if l in langs}
+            })
+            i = j + 1
+        
+        return occurrences
+
+
+def primary_value(occurrence):
+    """``(kind, value)`` of the first language giving the phrase a value."""
+    for lang, value in occurrence['values'].items():
+        if value is not None:
+            return occurrence['kinds'][lang], value
+    return None, None
+
+
+def format_value(kind, value):
+    """Show a value with its kind, unless it is a plain cardinal."""
+    if kind in (None, 'cardinal'):
+        return str(value)
+    return f'{value} ({kind})'
+
+
+def occurrence_message(occurrence):
+    """Describe an occurrence in one line (used for ASS comments)."""
+    if occurrence['value'] is None:
+        return f"Number word: '{occurrence['text']}'"
+    return f"Number word: '{occurrence['text']}' = {format_value(occurrence['kind'], occurrence['value'])}"
 
 
 class NumberDetectorApp:
@@ -41,10 +271,19 @@ class NumberDetectorApp:
         }
         
         self.current_lang = tk.StringVar(value='English (US)')
+        self.multi_lang = tk.BooleanVar(value=False)
         self.number_dict_cache = {}
+        self.matcher = NumberMatcher()
+        self.max_num = 1000
+        self.pending_dicts = {}
+        self.analysis_pending = False
+        self.executor = None
+        self.occurrences = []
+        self.document = None
         
         self.setup_ui()
-        self.generate_number_dictionary()
+        self.start_dictionary_warmup()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
     def setup_ui(self):
         """Create the user interface."""
@@ -110,16 +349,30 @@ class NumberDetectorApp:
         
         self.lang_dropdown = ttk.Combobox(
             lang_frame,
-            textvariable=self.current_lang,
             values=list(self.languages.keys()),
             state='readonly',
             width=18,
             font=("Segoe UI", 9),
             style='Custom.TCombobox'
         )
+        self.lang_dropdown.set(self.current_lang.get())
         self.lang_dropdown.pack(side=tk.LEFT)
         self.lang_dropdown.bind('<<ComboboxSelected>>', self.on_language_change)
         
+        multi_check = tk.Checkbutton(
+            lang_frame,
+            text="All languages",
+            variable=self.multi_lang,
+            font=("Segoe UI", 9),
+            bg=self.colors['primary'],
+            fg="white",
+            selectcolor=self.colors['primary_dark'],
+            activebackground=self.colors['primary'],
+            activeforeground="white",
+            command=self.on_multi_lang_toggle
+        )
+        multi_check.pack(side=tk.LEFT, padx=(10, 0))
+        
     def create_input_section(self, parent):
         """Create the input text section."""
         input_card = tk.Frame(parent, bg=self.colors['bg'], relief=tk.FLAT, bd=2)
@@ -167,8 +420,7 @@ class NumberDetectorApp:
         scrollbar_input.config(command=self.input_text.yview)
         
         # Sample text
-        sample_text = "I bought three apples and five oranges at the market. The event gathered one thousand people and lasted two hours. Zero problems, one hundred solutions! There were three hundred and forty-two registrants."
-        self.input_text.insert("1.0", sample_text)
+        self.input_text.insert("1.0", SAMPLE_TEXTS['en'])
         
     def create_control_section(self, parent):
         """Create the control section with analyze button."""
@@ -190,12 +442,32 @@ class NumberDetectorApp:
             pady=12,
             command=self.analyze_text
         )
-        self.analyze_btn.pack()
+        self.analyze_btn.pack(side=tk.LEFT, expand=True, anchor='e', padx=(0, 5))
         
         # Hover effect
         self.analyze_btn.bind("<Enter>", lambda e: self.analyze_btn.config(bg=self.colors['primary_dark']))
         self.analyze_btn.bind("<Leave>", lambda e: self.analyze_btn.config(bg=self.colors['primary']))
         
+        # Export button
+        self.export_btn = tk.Button(
+            control_frame,
+            text="EXPORT",
+            font=("Segoe UI", 11, "bold"),
+            bg=self.colors['accent'],
+            fg="white",
+            activebackground='#E64A19',
+            activeforeground="white",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=20,
+            pady=12,
+            command=self.export_results
+        )
+        self.export_btn.pack(side=tk.LEFT, expand=True, anchor='w')
+        
+        self.export_btn.bind("<Enter>", lambda e: self.export_btn.config(bg='#E64A19'))
+        self.export_btn.bind("<Leave>", lambda e: self.export_btn.config(bg=self.colors['accent']))
+        
     def create_output_section(self, parent):
         """Create the output section with results."""
         output_card = tk.Frame(parent, bg=self.colors['bg'], relief=tk.FLAT, bd=2)
@@ -293,86 +565,101 @@ class NumberDetectorApp:
         self.numbers_list.grid(row=0, column=0, sticky='nsew')
         scrollbar_list.config(command=self.numbers_list.yview)
         
-    def generate_number_dictionary(self, max_num=1000):
-        """Generate dictionary of number words using num2words."""
-        lang_code = self.languages[self.current_lang.get()]
+    def start_dictionary_warmup(self):
+        """Build every language's dictionary in a background process pool."""
+        lang_codes = [l for l in self.languages.values() if l not in self.number_dict_cache]
+        workers = min(len(lang_codes), os.cpu_count() or 1) or 1
         
-        if lang_code in self.number_dict_cache:
-            return
+        try:
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+        except (OSError, NotImplementedError):
+            # No process support (e.g. restricted sandbox): fall back to a thread
+            self.executor = ThreadPoolExecutor(max_workers=1)
         
-        numbers_set = set()
+        self.pending_dicts = {
+            lang_code: self.executor.submit(build_number_words, lang_code, self.max_num)
+            for lang_code in lang_codes
+        }
         
-        # Generate numbers from 0 to max_num
-        for i in range(max_num + 1):
-            try:
-                text_num = num2words(i, lang=lang_code)
-                numbers_set.add(text_num.lower())
-                # Add individual words from compound numbers
-                words = re.findall(r'\b\w+\b', text_num.lower())
-                numbers_set.update(words)
-            except:
-                pass
-        
-        # Add specific large numbers
-        for num in [1000, 10000, 100000, 1000000, 1000000000]:
+        self.update_language_labels()
+        self.root.after(100, self.poll_dictionaries)
+    
+    def poll_dictionaries(self):
+        """Install finished dictionaries without blocking the UI thread."""
+        for lang_code, future in list(self.pending_dicts.items()):
+            if not future.done():
+                continue
+            del self.pending_dicts[lang_code]
             try:
-                text_num = num2words(num, lang=lang_code)
-                numbers_set.add(text_num.lower())
-                words = re.findall(r'\b\w+\b', text_num.lower())
-                numbers_set.update(words)
-            except:
-                pass
+                words = future.result()
+            except Exception:
+                # Broken pool or worker error: build this language here instead
+                words = build_number_words(lang_code, self.max_num)
+            self.install_number_dictionary(lang_code, words)
         
-        # Remove common connectors
-        connectors = {'and', 'e', 'de', 'a', 'o', 'the', 'of'}
-        numbers_set = numbers_set - connectors
+        self.update_language_labels()
         
-        self.number_dict_cache[lang_code] = list(numbers_set)
+        if self.analysis_pending and self.languages_ready():
+            self.analysis_pending = False
+            self.analyze_text()
         
-    def find_number_words(self, text):
-        """Find all number words in the text."""
-        lang_code = self.languages[self.current_lang.get()]
-        number_words = self.number_dict_cache.get(lang_code, [])
-        
-        if not number_words:
-            return []
-        
-        pattern = r'\b(' + '|'.join(re.escape(n) for n in number_words) + r')\b'
-        occurrences = []
-        
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            occurrences.append({
-                'text': match.group(),
-                'start': match.start(),
-                'end': match.end()
-            })
-        
-        return occurrences
+        if self.pending_dicts:
+            self.root.after(100, self.poll_dictionaries)
+        else:
+            self.executor.shutdown(wait=False)
+    
+    def install_number_dictionary(self, lang_code, words):
+        """Add a built dictionary to the cache and the merged matcher."""
+        if lang_code in self.number_dict_cache:
+            return
+        self.number_dict_cache[lang_code] = words
+        self.matcher.add_language(lang_code, words)
+    
+    def update_language_labels(self):
+        """Mark languages whose dictionary is still warming up."""
+        labels = [
+            name + (LOADING_SUFFIX if lang_code in self.pending_dicts else '')
+            for name, lang_code in self.languages.items()
+        ]
+        self.lang_dropdown['values'] = labels
+        self.lang_dropdown.set(labels[list(self.languages).index(self.current_lang.get())])
+    
+    def languages_ready(self):
+        """Whether every enabled language has its dictionary."""
+        return all(l in self.number_dict_cache for l in self.enabled_languages())
+    
+    def enabled_languages(self):
+        """Language codes scanned by the analysis."""
+        if self.multi_lang.get():
+            return list(self.languages.values())
+        return [self.languages[self.current_lang.get()]]
     
-    def convert_word_to_number(self, word):
-        """Try to convert a number word to its numeric value."""
-        lang_code = self.languages[self.current_lang.get()]
-        word_lower = word.lower()
+    def find_number_words(self, document):
+        """Find all number words in a tokenized document."""
+        langs = [l for l in self.enabled_languages() if l in self.number_dict_cache]
         
-        # Try numbers up to 1000
-        for i in range(1001):
-            try:
-                if num2words(i, lang=lang_code).lower() == word_lower:
-                    return i
-            except:
-                pass
+        if not langs:
+            return []
         
-        return None
+        return self.matcher.find(document, langs)
     
     def analyze_text(self):
         """Analyze the input text and display results."""
-        text = self.input_text.get("1.0", tk.END).strip()
+        text = self.input_text.get("1.0", "end-1c")
         
-        if not text:
+        if not text.strip():
+            return
+        
+        if not self.languages_ready():
+            self.analysis_pending = True
+            self.counter_label.config(text="Loading number dictionaries…")
             return
         
         # Find number words
-        occurrences = self.find_number_words(text)
+        document = TokenizedDocument(text)
+        occurrences = self.find_number_words(document)
+        self.occurrences = occurrences
+        self.document = document
         
         # Update counter
         count = len(occurrences)
@@ -384,63 +671,109 @@ class NumberDetectorApp:
         self.output_text.config(state=tk.NORMAL)
         self.output_text.delete("1.0", tk.END)
         
-        # Display highlighted text
+        # Display highlighted text, tagging every number in one call
+        self.output_text.insert(tk.END, text)
         if occurrences:
-            last_pos = 0
+            ranges = []
             for oc in occurrences:
-                # Text before the number
-                self.output_text.insert(tk.END, text[last_pos:oc['start']])
-                # Highlighted number
-                self.output_text.insert(tk.END, oc['text'], "number")
-                last_pos = oc['end']
-            
-            # Remaining text
-            self.output_text.insert(tk.END, text[last_pos:])
-        else:
-            self.output_text.insert(tk.END, text)
+                ranges.append(document.tk_index(oc['start']))
+                ranges.append(document.tk_index(oc['end']))
+            self.output_text.tag_add("number", *ranges)
         
         self.output_text.config(state=tk.DISABLED)
         
         # Update numbers list
         self.numbers_list.delete(0, tk.END)
         unique_numbers = {}
-        numeric_values = {}
+        first_occurrences = {}
+        multi = len(self.enabled_languages()) > 1
         
         for oc in occurrences:
-            num_word = oc['text'].lower()
+            num_word = ' '.join(oc['text'].lower().split())
             unique_numbers[num_word] = unique_numbers.get(num_word, 0) + 1
-            
-            if num_word not in numeric_values:
-                numeric_values[num_word] = self.convert_word_to_number(num_word)
+            first_occurrences.setdefault(num_word, oc)
         
         for num_word, count in sorted(unique_numbers.items()):
-            value = numeric_values.get(num_word)
+            oc = first_occurrences[num_word]
+            kind, value = primary_value(oc)
+            tag = f" [{', '.join(oc['values'])}]" if multi else ''
             if value is not None:
-                self.numbers_list.insert(tk.END, f"  • '{num_word}' = {value} - {count}x")
+                self.numbers_list.insert(tk.END, f"  • '{num_word}' = {format_value(kind, value)}{tag} - {count}x")
             else:
-                self.numbers_list.insert(tk.END, f"  • '{num_word}' - {count}x")
+                self.numbers_list.insert(tk.END, f"  • '{num_word}'{tag} - {count}x")
     
-    def on_language_change(self, event=None):
-        """Handle language selection change."""
-        self.generate_number_dictionary()
+    def iter_export_records(self):
+        """Yield occurrences with line numbers and values, in text order."""
+        for oc in self.occurrences:
+            kind, value = primary_value(oc)
+            yield {
+                'line': self.document.line_of(oc['start']),
+                'start': oc['start'],
+                'end': oc['end'],
+                'text': oc['text'],
+                'lang': ','.join(oc['values']),
+                'kind': kind,
+                'value': value
+            }
+    
+    def export_results(self):
+        """Export the last analysis to JSONL, CSV or ASS comments."""
+        if not self.occurrences:
+            messagebox.showwarning("Warning", "No numbers to export")
+            return
         
-        # Update sample text based on language
-        lang_code = self.languages[self.current_lang.get()]
+        filepath = filedialog.asksaveasfilename(
+            title="Export Results",
+            defaultextension=".jsonl",
+            filetypes=EXPORT_FILETYPES
+        )
+        if not filepath:
+            return
         
-        if lang_code == 'pt_BR':
-            sample_text = "Comprei três maçãs e cinco laranjas no mercado. O evento reuniu mil pessoas e durou duas horas. Zero problemas, cem soluções! Foram trezentos e quarenta e dois inscritos."
-        else:
-            sample_text = "I bought three apples and five oranges at the market. The event gathered one thousand people and lasted two hours. Zero problems, one hundred solutions! There were three hundred and forty-two registrants."
+        try:
+            count = export_results(
+                self.iter_export_records(),
+                filepath,
+                EXPORT_FIELDS,
+                self.document.text.split('\n'),
+                occurrence_message
+            )
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Export failed: {e}")
+            return
         
-        self.input_text.delete("1.0", tk.END)
-        self.input_text.insert("1.0", sample_text)
+        messagebox.showinfo("Success", f"Exported {count} number(s)")
+    
+    def on_multi_lang_toggle(self):
+        """Handle the multi-language mode checkbox."""
+        self.analyze_text()
+    
+    def on_language_change(self, event=None):
+        """Handle language selection change."""
+        self.current_lang.set(self.lang_dropdown.get().replace(LOADING_SUFFIX, ''))
+        self.analysis_pending = False
+        
+        # Swap the sample text, but never overwrite the user's own text
+        current_text = self.input_text.get("1.0", "end-1c").strip()
+        if current_text in SAMPLE_TEXTS.values():
+            lang_code = self.languages[self.current_lang.get()]
+            sample_text = SAMPLE_TEXTS.get(lang_code, SAMPLE_TEXTS['en'])
+            self.input_text.delete("1.0", tk.END)
+            self.input_text.insert("1.0", sample_text)
         
         # Clear results
+        self.occurrences = []
         self.output_text.config(state=tk.NORMAL)
         self.output_text.delete("1.0", tk.END)
         self.output_text.config(state=tk.DISABLED)
         self.numbers_list.delete(0, tk.END)
         self.counter_label.config(text="0 numbers found")
+    
+    def on_close(self):
+        """Stop background dictionary builds and close the window."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
 
 
 def main():
@@ -0,0 +1,137 @@
+"""
+Result Export
+Streaming writers for analysis results (JSONL, JSON, CSV, ASS comments).
+
+Results are plain dicts with at least a 1-based "line" key. Every writer
+consumes them one at a time and writes straight to disk, so a report with
+hundreds of thousands of hits never has to be held in memory as text.
+"""
+
+import csv
+import json
+import os
+
+from ass_events import EVENT_KINDS, ScriptParser, format_event
+
+
+EXPORT_FORMATS = {".jsonl": "jsonl", ".json": "json", ".csv": "csv", ".ass": "ass"}
+BUFFER_SIZE = 1 << 20
+
+
+def export_format(path):
+    """Guess the export format from a file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: '{ext}'")
+    return EXPORT_FORMATS[ext]
+
+
+def write_jsonl(results, path, fields):
+    """Write one JSON object per line. Returns the number of results."""
+    count = 0
+    dumps = json.dumps
+    with open(path, "w", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+        for result in results:
+            f.write(dumps({k: result.get(k) for k in fields}, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def write_json(results, path, fields):
+    """Write a JSON array, one object per line. Returns the number of results."""
+    count = 0
+    dumps = json.dumps
+    with open(path, "w", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+        f.write("[")
+        for result in results:
+            f.write(",\n" if count else "\n")
+            f.write(dumps({k: result.get(k) for k in fields}, ensure_ascii=False))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+
+def write_csv(results, path, fields):
+    """Write a CSV file with a header row. Returns the number of results."""
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="", buffering=BUFFER_SIZE) as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for result in results:
+            writer.writerow(result)
+            count += 1
+    return count
+
+
+def write_ass_comments(results, path, source_lines, message, name="QC"):
+    """Copy an ASS script, inserting a Comment event after each flagged line.
+
+    ``results`` must be sorted by line and ``message`` turns a result into
+    the comment text. Each comment reuses the timing and style of the event
+    it follows, so it shows up next to it in the editor; results on lines
+    that are not events are skipped. Returns the number of comments written.
+
+    The copy is written next to ``path`` and moved over it once complete,
+    so exporting onto the source script itself never truncates it while
+    its lines are still being read.
+    """
+    results = iter(results)
+    pending = next(results, None)
+    parser = ScriptParser()
+    count = 0
+    separator = ""
+    final_newline = False
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8-sig", buffering=BUFFER_SIZE) as f:
+        for line_num, line in enumerate(source_lines, 1):
+            final_newline = line.endswith("\n")
+            line = line.rstrip("\r\n").lstrip("\ufeff")
+            f.write(separator)
+            f.write(line)
+            separator = "\n"
+            entry = parser.feed(line_num, line)
+            if pending is None or pending["line"] > line_num:
+                continue
+
+            is_event = entry is not None and entry.kind in EVENT_KINDS
+            while pending is not None and pending["line"] <= line_num:
+                if is_event and pending["line"] == line_num:
+                    overrides = {
+                        "Name": name,
+                        "MarginL": "0",
+                        "MarginR": "0",
+                        "MarginV": "0",
+                        "Effect": "",
+                        "Text": " ".join(message(pending).split()),
+                    }
+                    fields = {
+                        key: overrides.get(key, value)
+                        for key, value in entry.fields.items()
+                    }
+                    f.write("\n")
+                    f.write(format_event("Comment", fields))
+                    count += 1
+                pending = next(results, None)
+        if final_newline:
+            f.write("\n")
+    os.replace(tmp_path, path)
+    return count
+
+
+def export_results(results, path, fields, source_lines=None, message=None):
+    """Export results to ``path``, picking the writer from its extension.
+
+    ASS export needs the original script lines and a ``message`` callable.
+    """
+    fmt = export_format(path)
+    if fmt == "jsonl":
+        return write_jsonl(results, path, fields)
+    if fmt == "json":
+        return write_json(results, path, fields)
+    if fmt == "csv":
+        return write_csv(results, path, fields)
+    if source_lines is None or message is None:
+        raise ValueError("ASS export needs the source script")
+    return write_ass_comments(results, path, source_lines, message)
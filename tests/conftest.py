@@ -0,0 +1,74 @@
+"""Shared fixtures: the tools are scripts, so they are loaded by path."""
+
+import importlib.util
+import os
+import random
+import sys
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SYLLABLES = ["ka", "shi", "tsu", "ryo", "u", "ta", "no", "mi", "ha", "ne", "sa", "ki"]
+FILLER = ["the", "a", "said", "she", "went", "home", "and", "then", "it", "was"]
+
+
+def load_tool(filename):
+    """Import a hyphenated tool script as a module."""
+    name = os.path.splitext(filename)[0].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_terms(count, seed=0):
+    """Romanized name-like terms, deterministic for a seed."""
+    rng = random.Random(seed)
+    terms = set()
+    while len(terms) < count:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        terms.add(word.capitalize())
+    return sorted(terms)
+
+
+def misspell(word, rng):
+    """Drop, double or swap one letter."""
+    i = rng.randrange(1, len(word))
+    edit = rng.randrange(3)
+    if edit == 0:
+        return word[:i] + word[i + 1 :]
+    if edit == 1:
+        return word[:i] + word[i] + word[i:]
+    return word[: i - 1] + word[i] + word[i - 1] + word[i + 1 :]
+
+
+def synthetic_document(terms, lines, words_per_line=12, seed=0):
+    """Subtitle-like lines mixing filler, terms and misspelled terms."""
+    rng = random.Random(seed)
+    variants = [misspell(term, rng) for term in terms]
+    out = []
+    for _ in range(lines):
+        words = []
+        for _ in range(words_per_line):
+            roll = rng.random()
+            if roll < 0.1:
+                words.append(rng.choice(terms))
+            elif roll < 0.2:
+                words.append(rng.choice(variants))
+            else:
+                words.append(rng.choice(FILLER))
+        out.append(" ".join(words))
+    return "\n".join(out)
+
+
+@pytest.fixture(scope="session")
+def fuzzy():
+    return load_tool("fuzzy-text-checker.py")
+
+
+@pytest.fixture(scope="session")
+def numbers():
+    return load_tool("number-word-detector.py")
@@ -0,0 +1,152 @@
+"""Checker daemon service and watch mode."""
+
+import asyncio
+import io
+import json
+import os
+import threading
+
+import pytest
+
+from conftest import load_tool
+
+
+HEADER = """[Script Info]
+Title: Test
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+
+def dialogue(text):
+    return f"Dialogue: 0,0:00:01.00,0:00:02.00,Default,,0,0,0,,{text}\n"
+
+
+@pytest.fixture(scope="module")
+def daemon():
+    return load_tool("checker-daemon.py")
+
+
+@pytest.fixture
+def service(daemon, tmp_path):
+    terms = tmp_path / "terms.txt"
+    terms.write_text("Nezuko\nTanjirou\n", encoding="utf-8")
+    return daemon.CheckerService([str(terms)], ["en"])
+
+
+def save(path, lines, mtime):
+    path.write_text(HEADER + "".join(map(dialogue, lines)), encoding="utf-8")
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_watch_reports_only_the_issues_that_changed(daemon, service, tmp_path):
+    scripts = tmp_path / "episodes"
+    scripts.mkdir()
+    script = scripts / "ep01.ass"
+    output = io.StringIO()
+    watcher = daemon.ScriptWatcher(service, str(scripts), debounce=0, output=output)
+
+    save(script, ["Nezko said twenty-one words", "Tanjiro ran"], 10**9)
+    watcher.poll(0)
+    watcher.poll(1)
+    first = output.getvalue().splitlines()
+    assert len(first) == 3 and all(line.startswith("+ ") for line in first)
+
+    # Fix one word and insert a line above: only the fixed typo is reported
+    output.truncate(0)
+    output.seek(0)
+    save(script, ["Hello", "Nezuko said twenty-one words", "Tanjiro ran"], 2 * 10**9)
+    watcher.poll(2)
+    watcher.poll(3)
+    report = output.getvalue().splitlines()
+    assert len(report) == 1
+    assert report[0].startswith("- ep01.ass:6: 'Nezko' -> 'Nezuko'")
+
+
+def test_check_file_checks_only_dialogue_text(daemon, service, tmp_path):
+    script = tmp_path / "ep01.ass"
+    script.write_text(
+        HEADER.replace("Title: Test", "Title: Nezko")
+        + dialogue(r"{\fnNezko}Nezko met Tanjiro")
+        + "Comment: 0,0:00:01.00,0:00:02.00,Default,,0,0,0,,Nezko\n",
+        encoding="utf-8",
+    )
+
+    report = service.check_file(str(script))
+
+    typos = [(typo["line"], typo["found"], typo["start"]) for typo in report["typos"]]
+    assert typos == [(6, "Nezko", 1), (6, "Tanjiro", 11)]
+
+
+def test_check_text_scores_down_to_the_threshold_only(daemon, service, monkeypatch):
+    floors = []
+    scan = daemon.fuzzy.ScoreTable.scan
+
+    def recording_scan(*args, **kwargs):
+        floors.append(kwargs["floor"])
+        return scan(*args, **kwargs)
+
+    monkeypatch.setattr(daemon.fuzzy.ScoreTable, "scan", recording_scan)
+    report = service.check_text("Nezko and Tanjiro", threshold=90)
+
+    assert floors == [90.0]
+    assert all(typo["ratio"] >= 90 for typo in report["typos"])
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{"langs": "en"}, {"langs": ["xx"]}, {"threshold": "high"}, {"threshold": 120}],
+)
+def test_invalid_params_are_rpc_errors(daemon, service, params):
+    request = {"jsonrpc": "2.0", "id": 1, "method": "check_text"}
+    request["params"] = dict(params, text="twenty-one")
+
+    response = daemon.respond(service, request)
+
+    assert response["error"]["code"] == -32602
+
+
+def test_scans_run_one_at_a_time_off_the_event_loop(daemon, service, tmp_path):
+    socket_path = str(tmp_path / "daemon.sock")
+    release = threading.Event()
+    scanning = []
+    check_text = service.check_text
+
+    def slow_check_text(**params):
+        scanning.append(threading.get_ident())
+        assert len(scanning) == 1 or release.is_set()
+        release.wait(5)
+        return check_text(**params)
+
+    service.check_text = slow_check_text
+
+    async def call(method, params):
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        writer.write(json.dumps(request).encode() + b"\n")
+        response = json.loads(await reader.readline())
+        writer.close()
+        return response
+
+    async def scenario():
+        server = asyncio.create_task(daemon.serve(service, socket_path=socket_path))
+        while not os.path.exists(socket_path):
+            await asyncio.sleep(0.01)
+        scans = [
+            asyncio.create_task(call("check_text", {"text": "Nezko"})) for _ in range(2)
+        ]
+        while not scanning:
+            await asyncio.sleep(0.01)
+        # The loop still answers while a scan is running
+        assert (await call("ping", []))["result"] == "pong"
+        assert len(scanning) == 1
+        release.set()
+        reports = await asyncio.gather(*scans)
+        server.cancel()
+        return reports
+
+    reports = asyncio.run(scenario())
+    assert all(report["result"]["typos"] for report in reports)
+    assert len(scanning) == 2 and threading.get_ident() not in scanning
+
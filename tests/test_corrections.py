@@ -0,0 +1,69 @@
+"""Applying a correction to every occurrence of a word, without rescanning."""
+
+import pytest
+
+from conftest import synthetic_document, synthetic_terms
+from document_tokenizer import TokenizedDocument
+
+
+TEXT = "Nezko met Tanjro.\nNezko and Inoske, nezko!\n\nTanjro-san saw Nezko"
+
+
+def spans_of(document, word):
+    return [
+        (document.starts[i], document.ends[i])
+        for i in range(len(document))
+        if document.token(i).lower() == word
+    ]
+
+
+@pytest.mark.parametrize("replacement", ["Nezuko", "Nez"])
+def test_replace_spans_matches_a_fresh_tokenization(replacement):
+    document = TokenizedDocument(TEXT)
+    shift = document.replace_spans(spans_of(document, "nezko"), replacement)
+
+    fresh = TokenizedDocument(
+        TEXT.replace("Nezko", replacement).replace("nezko", replacement)
+    )
+    assert document.text == fresh.text
+    assert document.starts == fresh.starts
+    assert document.ends == fresh.ends
+    assert document.line_starts == fresh.line_starts
+
+    # Untouched offsets map to the same text
+    old = TEXT.index("Inoske")
+    assert document.text[shift(old) : shift(old) + 6] == "Inoske"
+    assert document.line_of(shift(old)) == 2
+
+
+def test_apply_correction_matches_a_fresh_scan(fuzzy):
+    terms = synthetic_terms(40)
+    terms_index = fuzzy.TermsIndex()
+    terms_index.update("\n".join(terms))
+    document = TokenizedDocument(synthetic_document(terms, 300))
+    table = fuzzy.ScoreTable.scan(document, terms_index)
+    table.results(fuzzy.SCORE_FLOOR)  # cache every hit, so all are shifted
+
+    corrected = set()
+    for _, word, term in table.pairs[:5:2]:
+        if word not in table.occurrences:
+            continue
+        spans = [
+            (document.starts[i], document.ends[i]) for i in table.occurrences[word]
+        ]
+        table.apply_correction(word, document.replace_spans(spans, term))
+        corrected.add(fuzzy.normalize_for_comparison(term))
+
+    fresh = fuzzy.ScoreTable.scan(TokenizedDocument(document.text), terms_index)
+
+    def compared(table):
+        # Corrected words now spell a term, which the table does not rescore
+        results = [
+            result
+            for result in table.results(fuzzy.SCORE_FLOOR)
+            if fuzzy.normalize_for_comparison(result["found"]) not in corrected
+        ]
+        return sorted(results, key=lambda result: (result["start"], result["term"]))
+
+    assert corrected
+    assert compared(table) == compared(fresh)
@@ -0,0 +1,175 @@
+"""Font checker: name tables, script fonts and the comparison."""
+
+import struct
+import sys
+import zipfile
+
+import pytest
+
+from conftest import load_tool
+
+
+SCRIPT = """[Script Info]
+Title: Test
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize
+Style: Default,Open Sans,48
+Style: *Signs,Noto Serif,40
+Style: Unused,Comic Neue,40
+Style: Alt,Lato,40
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+Dialogue: 0,0:00:01.00,0:00:02.00,Default,,0,0,0,,Hello
+Dialogue: 0,0:00:02.00,0:00:03.00,Signs,,0,0,0,,{\\fn@Klee One\\b1}Sign
+Dialogue: 0,0:00:03.00,0:00:04.00,*Default,,0,0,0,,{\\rAlt}Styled {\\r}reset
+Comment: 0,0:00:04.00,0:00:05.00,Default,,0,0,0,,{\\fnComment Only}note
+"""
+
+
+@pytest.fixture(scope="module")
+def fonts():
+    return load_tool("font-checker.py")
+
+
+def name_table(records):
+    """A 'name' table from ``(platform, encoding, name id, bytes)`` records."""
+    entries = b""
+    storage = b""
+    for platform_id, encoding_id, name_id, data in records:
+        entries += struct.pack(
+            ">HHHHHH", platform_id, encoding_id, 0, name_id, len(data), len(storage)
+        )
+        storage += data
+    return struct.pack(">HHH", 0, len(records), 6 + len(entries)) + entries + storage
+
+
+def sfnt(records, base=0):
+    """A font holding only a 'name' table; offsets are from the file start."""
+    table = name_table(records)
+    directory = struct.pack(">IHHHH", 0x00010000, 1, 16, 0, 0)
+    directory += struct.pack(">4sIII", b"name", 0, base + 12 + 16, len(table))
+    return directory + table
+
+
+def windows(name_id, name):
+    return (3, 1, name_id, name.encode("utf-16-be"))
+
+
+def mac(name_id, name):
+    return (1, 0, name_id, name.encode("mac_roman"))
+
+
+def collection(fonts_records):
+    """A TrueType collection of fonts built from record lists."""
+    offset = 12 + 4 * len(fonts_records)
+    offsets = []
+    fonts = []
+    for records in fonts_records:
+        offsets.append(offset)
+        fonts.append(sfnt(records, offset))
+        offset += len(fonts[-1])
+    header = b"ttcf" + struct.pack(">HHI", 1, 0, len(fonts))
+    header += struct.pack(f">{len(fonts)}I", *offsets)
+    return header + b"".join(fonts)
+
+
+def test_sfnt_names_reads_windows_and_mac_records(fonts):
+    data = sfnt(
+        [
+            windows(1, "Open Sans"),
+            windows(2, "Regular"),
+            windows(4, "Open Sans Regular"),
+            mac(1, "Open Sans Mac"),
+            mac(16, "Café Sans"),
+            (1, 1, 4, "ignored".encode("utf-16-be")),
+            windows(4, "   "),
+        ]
+    )
+
+    assert fonts.sfnt_names(data) == {
+        "Open Sans",
+        "Open Sans Regular",
+        "Open Sans Mac",
+        "Café Sans",
+    }
+
+
+def test_sfnt_names_without_name_table(fonts):
+    assert fonts.sfnt_names(struct.pack(">IHHHH", 0x00010000, 0, 0, 0, 0)) == set()
+
+
+def test_font_names_reads_every_font_of_a_collection(fonts):
+    data = collection(
+        [
+            [windows(1, "Noto Serif"), windows(4, "Noto Serif Regular")],
+            [mac(1, "Noto Serif Display"), mac(4, "Noto Serif Display Bold")],
+            [windows(16, "Noto Serif CJK")],
+        ]
+    )
+
+    assert fonts.font_names(data) == {
+        "Noto Serif",
+        "Noto Serif Regular",
+        "Noto Serif Display",
+        "Noto Serif Display Bold",
+        "Noto Serif CJK",
+    }
+    assert fonts.font_names(sfnt([windows(1, "Lato")])) == {"Lato"}
+
+
+def test_script_fonts_follow_used_styles_and_overrides(fonts):
+    found = fonts.script_fonts(SCRIPT.splitlines(keepends=True))
+
+    assert found == {
+        "open sans": ("Open Sans", "style Default"),
+        "noto serif": ("Noto Serif", "style Signs"),
+        "klee one": ("@Klee One", "line 14"),
+        "lato": ("Lato", "style Alt"),
+    }
+
+
+def test_compare_fonts_reports_missing_and_unused(fonts):
+    needed = fonts.script_fonts(SCRIPT.splitlines(keepends=True))
+    provided = {
+        "OpenSans-Regular.ttf": {"Open Sans", "Open Sans Regular"},
+        "KleeOne.otf": {"KLEE ONE"},
+        "ComicNeue.ttf": {"Comic Neue"},
+        "broken.ttf": set(),
+    }
+
+    missing, unused = fonts.compare_fonts(needed, provided)
+    assert missing == [("Lato", "style Alt"), ("Noto Serif", "style Signs")]
+    assert unused == ["ComicNeue.ttf", "broken.ttf"]
+
+
+def test_check_fonts_reads_fonts_inside_a_zip(fonts, tmp_path):
+    script = tmp_path / "episode.ass"
+    script.write_text(SCRIPT, encoding="utf-8")
+    archive = tmp_path / "fonts.zip"
+    with zipfile.ZipFile(archive, "w") as f:
+        f.writestr("fonts/OpenSans.ttf", sfnt([windows(1, "Open Sans")]))
+        f.writestr(
+            "fonts/Family.ttc",
+            collection([[windows(1, "Noto Serif")], [mac(1, "Lato")]]),
+        )
+        f.writestr("fonts/Truncated.otf", b"OTTO")
+        f.writestr("fonts/readme.txt", "not a font")
+
+    missing, unused = fonts.check_fonts(str(script), [str(archive)])
+    assert missing == [("@Klee One", "line 14")]
+    assert unused == ["fonts/Truncated.otf"]
+
+
+def test_cli_reports_undecodable_scripts(fonts, tmp_path, monkeypatch, capsys):
+    script = tmp_path / "episode.ass"
+    script.write_bytes(SCRIPT.replace("Hello", "Ol\xe1").encode("latin-1"))
+    font = tmp_path / "OpenSans.ttf"
+    font.write_bytes(sfnt([windows(1, "Open Sans")]))
+
+    monkeypatch.setattr(sys, "argv", ["font-checker.py", str(script), str(font)])
+    with pytest.raises(SystemExit) as exit_info:
+        fonts.main()
+    assert exit_info.value.code == 2
+    assert "utf-8" in capsys.readouterr().err
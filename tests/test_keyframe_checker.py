@@ -0,0 +1,146 @@
+"""Keyframe log reading, timing checks and export."""
+
+from array import array
+import sys
+
+import pytest
+
+from ass_events import read_events
+from conftest import load_tool
+
+
+HEADER = """[Script Info]
+Title: Test
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+
+@pytest.fixture(scope="module")
+def keyframes():
+    return load_tool("keyframe-checker.py")
+
+
+def dialogue(start, end, text="Line"):
+    return f"Dialogue: 0,{start},{end},Default,,0,0,0,,{text}\n"
+
+
+def check(keyframes, events, keyframe_list, fps="24", max_distance=5):
+    lines = (HEADER + "".join(events)).splitlines(keepends=True)
+    return list(
+        keyframes.check_events(
+            read_events(lines),
+            array("I", keyframe_list),
+            keyframes.parse_fps(fps),
+            max_distance,
+        )
+    )
+
+
+def test_read_xvid_pass_log(keyframes):
+    log = [
+        "# XviD 2pass stat file (core version 1.1.-127)\n",
+        "# Please do not modify this file\n",
+        "\n",
+        "i 4 0 1 2 3 0 0 0\n",
+        "p 2 0 1 2 3 0 0 0\n",
+        "b 2 0 1 2 3 0 0 0\n",
+        "P 2 0 1 2 3 0 0 0\n",
+        "I 4 0 1 2 3 0 0 0\n",
+        "s 2 0 1 2 3 0 0 0\n",
+        "i 4 0 1 2 3 0 0 0\n",
+    ]
+
+    assert keyframes.read_keyframes(log).tolist() == [0, 4, 6]
+
+
+def test_read_keyframe_format_v1(keyframes):
+    log = ["\ufeff# keyframe format v1\n", "fps 0\n", "48\n", "0\n", "\n", "24\n"]
+
+    assert keyframes.read_keyframes(log).tolist() == [0, 24, 48]
+
+
+@pytest.mark.parametrize("log", [[], ["Frame 1\n", "i\n"]])
+def test_unknown_keyframe_logs_are_rejected(keyframes, log):
+    with pytest.raises(ValueError):
+        keyframes.read_keyframes(log)
+
+
+def test_boundaries_on_a_keyframe_are_not_flagged(keyframes):
+    # At 24 fps, frame 24 starts at 1.00 s and frame 48 at 2.00 s
+    assert check(keyframes, [dialogue("0:00:01.00", "0:00:02.00")], [0, 24, 48]) == []
+
+
+def test_boundaries_one_frame_off_are_flagged(keyframes):
+    results = check(keyframes, [dialogue("0:00:01.04", "0:00:01.95")], [0, 24, 48])
+
+    assert [
+        (r["boundary"], r["frame"], r["keyframe"], r["distance"]) for r in results
+    ] == [
+        ("start", 25, 24, -1),
+        ("end", 47, 48, 1),
+    ]
+
+
+def test_only_boundaries_within_the_distance_are_flagged(keyframes):
+    events = [
+        dialogue("0:00:01.21", "0:00:03.00"),  # start frame 30: 6 frames off
+        dialogue("0:00:01.17", "0:00:03.00"),  # start frame 29: 5 frames off
+    ]
+
+    results = check(keyframes, events, [24])
+    assert [(r["line"], r["distance"]) for r in results] == [(7, -5)]
+
+
+@pytest.mark.parametrize(
+    "start, frame",
+    [
+        ("0:00:00.50", 12),  # exactly on a frame start at 24 fps
+        ("0:00:00.51", 13),  # inside frame 12: the next frame is the first shown
+    ],
+)
+def test_times_round_up_to_the_next_frame(keyframes, start, frame):
+    results = check(keyframes, [dialogue(start, "0:00:05.00")], [frame + 1])
+
+    assert results[0]["frame"] == frame
+
+
+def test_ntsc_times_round_up_to_the_next_frame(keyframes):
+    # At 24000/1001 fps frame 24 starts at 1001 ms, so a line starting at
+    # 1.00 s first shows frame 24, and one starting at 1.01 s frame 25
+    on_keyframe = check(
+        keyframes, [dialogue("0:00:01.00", "0:00:05.00")], [24], "23.976"
+    )
+    assert on_keyframe == []
+
+    late = check(keyframes, [dialogue("0:00:01.01", "0:00:05.00")], [24], "23.976")
+    assert [(r["frame"], r["distance"]) for r in late] == [(25, -1)]
+
+
+def test_export_onto_the_checked_script(keyframes, tmp_path, monkeypatch):
+    script = tmp_path / "episode.ass"
+    # Every event starts one frame after a keyframe at 24 fps
+    events = [
+        f"Dialogue: 0,0:00:{i:02d}.05,0:00:{i:02d}.80,Default,,0,0,0,,Line {i}\n"
+        for i in range(1, 50)
+    ]
+    script.write_text(HEADER + "".join(events), encoding="utf-8")
+    log = tmp_path / "keyframes.txt"
+    log.write_text(
+        "# keyframe format v1\nfps 0\n" + "\n".join(str(24 * i) for i in range(60))
+    )
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["keyframe-checker.py", str(script), "--keyframes", str(log), "--fps", "24"]
+        + ["--export", str(script)],
+    )
+    keyframes.main()
+
+    lines = script.read_text(encoding="utf-8-sig").splitlines()
+    dialogues = [line for line in lines if line.startswith("Dialogue:")]
+    comments = [line for line in lines if line.startswith("Comment:")]
+    assert len(dialogues) == len(events)
+    assert comments
@@ -0,0 +1,50 @@
+"""Known-word lists."""
+
+import pytest
+
+from document_tokenizer import TokenizedDocument
+
+
+def test_bundled_wordlists_ship_with_the_tools(fuzzy):
+    assert {"en", "pt_BR"} <= set(fuzzy.available_wordlists())
+
+
+def test_bundled_wordlist_loads(fuzzy, tmp_path):
+    known = fuzzy.KnownWords(str(tmp_path / "known-words.txt"))
+    known.set_language("pt_BR")
+
+    assert "espada" in known
+    assert not any(word.startswith("#") for word in known.bundled_words)
+    assert "shinobu" not in known
+
+
+@pytest.mark.parametrize(
+    "language, words",
+    [
+        ("en", ["ten", "three", "hands", "days", "looking", "talked", "went"]),
+        ("pt_BR", ["três", "dez", "mãos", "dias", "olhando", "falou", "fomos"]),
+    ],
+)
+def test_bundled_wordlists_know_inflected_words(fuzzy, tmp_path, language, words):
+    known = fuzzy.KnownWords(str(tmp_path / "known-words.txt"))
+    known.set_language(language)
+
+    assert len(known.bundled_words) >= 10_000
+    assert [word for word in words if word not in known] == []
+
+
+def test_wordlist_words_are_never_scored(fuzzy, tmp_path, monkeypatch):
+    monkeypatch.setattr(fuzzy, "WORDLISTS_DIR", str(tmp_path))
+    (tmp_path / "xx.txt").write_text("# test list\nShine\n", encoding="utf-8")
+    index = fuzzy.TermsIndex()
+    index.update("Shinji\n")
+    document = TokenizedDocument("Shine and Shinjy")
+
+    known = fuzzy.KnownWords(str(tmp_path / "known-words.txt"))
+    assert fuzzy.available_wordlists() == ["xx"]
+    before = fuzzy.ScoreTable.scan(document, index, known, floor=60)
+    known.set_language("xx")
+    after = fuzzy.ScoreTable.scan(document, index, known, floor=60)
+
+    assert "shine" in before.occurrences
+    assert set(after.occurrences) == {"shinjy"}
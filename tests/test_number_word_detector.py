@@ -0,0 +1,51 @@
+"""Number word detection."""
+
+import pytest
+
+from document_tokenizer import TokenizedDocument
+
+
+@pytest.fixture(scope="module")
+def matcher(numbers):
+    matcher = numbers.NumberMatcher()
+    for lang in ("en", "pt_BR"):
+        matcher.add_language(lang, numbers.build_number_words(lang, 1000))
+    return matcher
+
+
+def found(matcher, text, lang):
+    return [
+        (oc["text"], oc["values"][lang])
+        for oc in matcher.find(TokenizedDocument(text), [lang])
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("a three-year-old girl", [("three", 3)]),
+        ("a five-minute break", [("five", 5)]),
+        ("a one-on-one talk", [("one", 1), ("one", 1)]),
+        ("she is twenty-one-years-old", [("twenty-one", 21)]),
+        ("forty-two donuts", [("forty-two", 42)]),
+    ],
+)
+def test_numbers_inside_hyphenated_compounds(matcher, text, expected):
+    assert found(matcher, text, "en") == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("duas mil pessoas", [("duas mil", 2000)]),
+        ("dois mil anos", [("dois mil", 2000)]),
+        ("duzentas mil pessoas", [("duzentas mil", 200000)]),
+        ("vinte e uma mil vozes", [("vinte e uma mil", 21000)]),
+    ],
+)
+def test_portuguese_thousands_agree_in_gender(matcher, text, expected):
+    assert found(matcher, text, "pt_BR") == expected
+
+
+def test_english_thousands(matcher):
+    assert found(matcher, "two thousand people", "en") == [("two thousand", 2000)]
@@ -0,0 +1,266 @@
+"""Performance budgets of the analysis hot paths.
+
+Wall-clock timings are too noisy to gate changes on, so these tests count
+the expensive operations instead (scorer calls, num2words calls, regex
+compilations) and measure peak memory with tracemalloc, on fixed
+synthetic corpora. A failure means a change made the work scale with the
+wrong thing, e.g. scoring per occurrence instead of per unique word.
+"""
+
+from contextlib import contextmanager
+import re
+import tracemalloc
+
+import pytest
+
+from conftest import synthetic_document, synthetic_terms
+from document_tokenizer import TokenizedDocument
+
+
+TERM_COUNT = 300
+SMALL_LINES = 2000
+LARGE_LINES = 8000
+
+
+class CallCounter:
+    """Wrap a callable and count its calls."""
+
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.func(*args, **kwargs)
+
+
+@contextmanager
+def regex_compilations():
+    """Count the patterns actually compiled (not served by re's cache)."""
+    counter = CallCounter(re._compiler.compile)
+    re.purge()
+    re._compiler.compile = counter
+    try:
+        yield counter
+    finally:
+        re._compiler.compile = counter.func
+
+
+@contextmanager
+def peak_memory():
+    """Measure the peak traced allocation of a block, in bytes."""
+    result = {}
+    tracemalloc.start()
+    try:
+        yield result
+    finally:
+        result["peak"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+
+@pytest.fixture(scope="module")
+def terms():
+    return synthetic_terms(TERM_COUNT)
+
+
+@pytest.fixture(scope="module")
+def terms_index(fuzzy, terms):
+    index = fuzzy.TermsIndex()
+    index.update("\n".join(terms))
+    return index
+
+
+@pytest.fixture(scope="module")
+def small_document(terms):
+    return TokenizedDocument(synthetic_document(terms, SMALL_LINES))
+
+
+@pytest.fixture(scope="module")
+def large_document(terms):
+    return TokenizedDocument(synthetic_document(terms, LARGE_LINES))
+
+
+def unique_words(fuzzy, document):
+    return {fuzzy.normalize_for_comparison(word) for _, _, word in document.tokens()}
+
+
+# Fuzzy text checker
+
+
+def test_scan_scores_each_unique_word_once(fuzzy, terms_index, large_document):
+    extract = CallCounter(fuzzy.process.extract)
+    candidates = CallCounter(terms_index.candidates)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(fuzzy.process, "extract", extract)
+        patch.setattr(terms_index, "candidates", candidates)
+        fuzzy.ScoreTable.scan(large_document, terms_index)
+
+    words = unique_words(fuzzy, large_document)
+    assert 0 < extract.calls <= len(words) < len(large_document) // 100
+    # Candidate terms are looked up once per word length
+    assert candidates.calls <= len({len(word) for word in words})
+
+
+def test_scan_skips_known_words_and_suppressed_pairs(
+    fuzzy, terms_index, small_document
+):
+    table = fuzzy.ScoreTable.scan(small_document, terms_index)
+    word, term = table.pairs[0][1], table.pairs[0][2]
+    known = {table.pairs[-1][1]} - {word}
+
+    extract = CallCounter(fuzzy.process.extract)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(fuzzy.process, "extract", extract)
+        rescanned = fuzzy.ScoreTable.scan(
+            small_document,
+            terms_index,
+            known_words=known,
+            suppressed={(word, fuzzy.normalize_for_comparison(term))},
+        )
+
+    assert extract.calls <= len(unique_words(fuzzy, small_document) - known)
+    assert (word, term) not in {(w, t) for _, w, t in rescanned.pairs}
+    assert known.isdisjoint(rescanned.occurrences)
+
+
+def test_threshold_changes_never_rescore(fuzzy, terms_index, small_document):
+    table = fuzzy.ScoreTable.scan(small_document, terms_index)
+    extract = CallCounter(fuzzy.process.extract)
+    ratio = CallCounter(fuzzy.fuzz.ratio)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(fuzzy.process, "extract", extract)
+        patch.setattr(fuzzy.fuzz, "ratio", ratio)
+        for threshold in range(fuzzy.SCORE_FLOOR, 101, 5):
+            table.results(threshold)
+            table.groups(threshold)
+            table.histogram()
+
+    assert extract.calls == 0
+    assert ratio.calls == 0
+
+
+def test_grouped_view_expands_only_opened_pairs(fuzzy, terms_index, small_document):
+    table = fuzzy.ScoreTable.scan(small_document, terms_index)
+    hit = CallCounter(table.hit)
+    table.hit = hit
+
+    groups = table.groups(fuzzy.SCORE_FLOOR)
+    ratio, word, term, count = groups[0]
+    table.hits(word, term, ratio)
+
+    assert len(groups) == len(table.pairs)
+    assert hit.calls == count
+    assert list(table._hits) == [(word, term)]
+
+
+def test_results_expand_only_the_requested_band(fuzzy, terms_index, small_document):
+    table = fuzzy.ScoreTable.scan(small_document, terms_index)
+    hit = CallCounter(table.hit)
+    table.hit = hit
+
+    def hit_count(threshold):
+        return sum(count for _, _, _, count in table.groups(threshold))
+
+    high = table.results(80)
+    assert hit.calls == len(high) == hit_count(80)
+    table.results(80)
+    assert hit.calls == hit_count(80)
+
+    # Lowering the threshold expands only the hits of the new band
+    band = table.band(70, 80)
+    assert len(band) == hit_count(70) - hit_count(80)
+    assert hit.calls == hit_count(70)
+    assert sorted(table.results(70), key=id) == sorted(high + band, key=id)
+
+
+def test_phonetic_scan_keys_each_word_once(fuzzy, terms_index, large_document):
+    phonetic_key = CallCounter(fuzzy.phonetic_key)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(fuzzy, "phonetic_key", phonetic_key)
+        fuzzy.ScoreTable.scan(large_document, terms_index, phonetic=True)
+
+    # One key per unique word, plus one per term (index and scoring)
+    words = unique_words(fuzzy, large_document)
+    assert phonetic_key.calls <= len(words) + 2 * TERM_COUNT
+
+
+def test_scan_compiles_no_patterns(fuzzy, terms_index, small_document):
+    terms_index.phonetic_candidates("")  # build the phonetic hash up front
+    with regex_compilations() as compilations:
+        fuzzy.ScoreTable.scan(small_document, terms_index)
+        fuzzy.ScoreTable.scan(small_document, terms_index, phonetic=True)
+        TokenizedDocument(small_document.text)
+
+    assert compilations.calls == 0
+
+
+def test_scan_memory_grows_with_vocabulary_not_tokens(
+    fuzzy, terms_index, small_document, large_document
+):
+    peaks = []
+    for document in (small_document, large_document):
+        with peak_memory() as memory:
+            fuzzy.ScoreTable.scan(document, terms_index)
+        peaks.append(memory["peak"])
+
+    extra_tokens = len(large_document) - len(small_document)
+    assert peaks[0] < 3_000_000
+    # Occurrences are kept as 4-byte array items, not Python objects
+    assert peaks[1] - peaks[0] < 8 * extra_tokens
+
+
+# Number word detector
+
+
+@pytest.mark.parametrize("lang", ["en", "pt_BR"])
+def test_dictionary_spells_each_number_once(numbers, lang):
+    max_num = 200
+    num2words = CallCounter(numbers.num2words)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(numbers, "num2words", num2words)
+        words = numbers.build_number_words(lang, max_num)
+
+    # One cardinal and one ordinal per number, plus one to learn how the
+    # thousands are spelled; variants are derived by rules
+    budget = (
+        (max_num + 1)
+        + len(numbers.LARGE_NUMBERS)
+        + 1
+        + max_num
+        + len(numbers.FRACTION_DENOMINATORS)
+    )
+    assert num2words.calls <= budget
+    assert words
+
+
+@pytest.fixture(scope="module")
+def matcher(numbers):
+    matcher = numbers.NumberMatcher()
+    for lang in ("en", "pt_BR"):
+        matcher.add_language(lang, numbers.build_number_words(lang, 1000))
+    return matcher
+
+
+@pytest.fixture(scope="module")
+def number_document(numbers):
+    sample = "\n".join(numbers.SAMPLE_TEXTS.values())
+    return TokenizedDocument("\n".join([sample] * 500))
+
+
+def test_find_does_no_spelling_or_compiling(numbers, matcher, number_document):
+    num2words = CallCounter(numbers.num2words)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(numbers, "num2words", num2words)
+        with regex_compilations() as compilations:
+            occurrences = matcher.find(number_document)
+
+    assert occurrences
+    assert num2words.calls == 0
+    assert compilations.calls == 0
+
+
+def test_find_memory_is_linear_in_tokens(numbers, matcher, number_document):
+    with peak_memory() as memory:
+        occurrences = matcher.find(number_document)
+
+    assert memory["peak"] < 120 * len(number_document) + 1200 * len(occurrences)
@@ -0,0 +1,71 @@
+"""Result export."""
+
+import json
+
+import pytest
+
+from result_export import export_results
+
+
+SCRIPT = """[Script Info]
+Title: Test
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+Dialogue: 0,0:00:01.00,0:00:02.00,Default,,0,0,0,,Hello Shinobou
+Dialogue: 0,0:00:03.00,0:00:04.00,Default,,0,0,0,,Bye
+"""
+
+
+def export_comments(path, source_lines):
+    return export_results(
+        iter([{"line": 6, "found": "Shinobou"}]),
+        str(path),
+        ["line"],
+        source_lines,
+        lambda result: f"Typo: {result['found']}",
+    )
+
+
+def test_export_onto_the_source_script(tmp_path):
+    path = tmp_path / "episode.ass"
+    path.write_text(SCRIPT, encoding="utf-8")
+
+    with open(path, encoding="utf-8-sig") as f:
+        count = export_comments(path, f)
+
+    lines = path.read_text(encoding="utf-8-sig").split("\n")
+    assert count == 1
+    assert lines[:6] == SCRIPT.split("\n")[:6]
+    assert lines[6].startswith("Comment: 0,0:00:01.00,0:00:02.00,Default,QC,")
+    assert lines[6].endswith(",Typo: Shinobou")
+    assert lines[7:] == SCRIPT.split("\n")[6:]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_export_keeps_the_trailing_newline(tmp_path):
+    for source in (SCRIPT, SCRIPT.rstrip("\n")):
+        path = tmp_path / "copy.ass"
+        export_comments(path, source.split("\n"))
+        written = path.read_text(encoding="utf-8-sig")
+        assert written.endswith("Bye\n" if source.endswith("\n") else "Bye")
+        assert written.count("\n") == source.count("\n") + 1
+
+
+@pytest.mark.parametrize("count", [0, 1, 3])
+def test_json_export_is_a_json_array(tmp_path, count):
+    path = tmp_path / "report.json"
+    results = ({"line": i, "found": f"Nezko{i}", "extra": True} for i in range(count))
+
+    assert export_results(results, str(path), ["line", "found"]) == count
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == [{"line": i, "found": f"Nezko{i}"} for i in range(count)]
+
+
+def test_jsonl_export_writes_one_object_per_line(tmp_path):
+    path = tmp_path / "report.jsonl"
+    export_results(iter([{"line": 1}, {"line": 2}]), str(path), ["line"])
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [{"line": 1}, {"line": 2}]
+
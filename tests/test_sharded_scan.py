@@ -0,0 +1,71 @@
+"""Sharded scans against the shared terms table."""
+
+from concurrent.futures import ThreadPoolExecutor
+import gc
+
+import pytest
+
+from conftest import synthetic_document, synthetic_terms
+from document_tokenizer import TokenizedDocument
+
+
+@pytest.fixture(scope="module")
+def document():
+    return TokenizedDocument(synthetic_document(synthetic_terms(60), 400))
+
+
+def build_index(fuzzy, terms):
+    index = fuzzy.TermsIndex()
+    index.update("\n".join(terms))
+    return index
+
+
+def sharded_scan(fuzzy, document, terms_index, shared_terms):
+    # Workers only need the table's name, so threads stand in for processes
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        return fuzzy.ScoreTable.scan(
+            document,
+            terms_index,
+            executor=executor,
+            shared_terms=shared_terms,
+            shards=8,
+        )
+
+
+def test_shared_table_does_not_match_a_rebuilt_index(fuzzy, document):
+    replaced = build_index(fuzzy, synthetic_terms(60))
+    address = id(replaced)
+    shared_terms = fuzzy.SharedTermsTable(replaced)
+    try:
+        del replaced
+        gc.collect()
+        # Allocate fresh indexes, which start at the same version, until one
+        # lands where the replaced index was (if it could be freed at all)
+        allocated = []
+        for _ in range(10_000):
+            rebuilt = fuzzy.TermsIndex()
+            if id(rebuilt) == address:
+                break
+            allocated.append(rebuilt)
+        rebuilt.update("\n".join(synthetic_terms(60, seed=1)))
+        assert not shared_terms.matches(rebuilt)
+
+        serial = fuzzy.ScoreTable.scan(document, rebuilt)
+        stale = sharded_scan(fuzzy, document, rebuilt, shared_terms)
+        assert stale.pairs == serial.pairs
+    finally:
+        shared_terms.close()
+
+
+def test_sharded_scan_equals_serial_scan_after_a_rebuild(fuzzy, document):
+    for seed in (0, 1):
+        terms_index = build_index(fuzzy, synthetic_terms(60, seed=seed))
+        shared_terms = fuzzy.SharedTermsTable(terms_index)
+        try:
+            serial = fuzzy.ScoreTable.scan(document, terms_index)
+            sharded = sharded_scan(fuzzy, document, terms_index, shared_terms)
+        finally:
+            shared_terms.close()
+        assert serial.pairs
+        assert sharded.pairs == serial.pairs
+        assert sharded.occurrences == serial.occurrences
@@ -0,0 +1,77 @@
+"""Terms index persistence."""
+
+import json
+
+import pytest
+
+
+TERMS = "Nezuko\nTanjirou\nZenitsu\n"
+
+
+@pytest.fixture
+def saved_index(fuzzy, tmp_path):
+    index = fuzzy.TermsIndex()
+    index.update(TERMS)
+    path = tmp_path / "terms.index.json"
+    index.save(str(path))
+    return path
+
+
+def test_saved_index_skips_parsing_unchanged_terms(fuzzy, saved_index, monkeypatch):
+    parses = []
+    parse_terms = fuzzy.parse_terms
+    monkeypatch.setattr(
+        fuzzy, "parse_terms", lambda content: parses.append(1) or parse_terms(content)
+    )
+
+    index = fuzzy.TermsIndex.load(str(saved_index))
+    assert index.update(TERMS) == ([], [])
+    assert not parses
+    assert set(index.terms) == {"Nezuko", "Tanjirou", "Zenitsu"}
+
+    assert index.update(TERMS + "Inosuke\n") == (["Inosuke"], [])
+    assert parses == [1]
+
+
+@pytest.mark.parametrize(
+    "damage",
+    [
+        lambda data: data.pop("buckets"),
+        lambda data: data.update(terms=data["terms"][:1]),
+        lambda data: data.update(terms=[["Nezuko"]]),
+        lambda data: data.update(terms=[[1, 2], [3, 4], [5, 6]]),
+        lambda data: data.update(buckets={"6": [0, 1, 2]}),
+        lambda data: data.update(buckets={"x": [0]}),
+        lambda data: data.update(version="new"),
+        lambda data: data.update(buckets=[]),
+    ],
+)
+def test_damaged_index_is_rebuilt(fuzzy, saved_index, damage):
+    data = json.loads(saved_index.read_text(encoding="utf-8"))
+    damage(data)
+    saved_index.write_text(json.dumps(data), encoding="utf-8")
+
+    assert fuzzy.TermsIndex.load(str(saved_index)) is None
+
+
+def test_truncated_index_is_rebuilt(fuzzy, saved_index):
+    content = saved_index.read_text(encoding="utf-8")
+    saved_index.write_text(content[: len(content) // 2], encoding="utf-8")
+
+    assert fuzzy.TermsIndex.load(str(saved_index)) is None
+
+
+def test_phonetic_index_is_published_complete(fuzzy, monkeypatch):
+    index = fuzzy.TermsIndex()
+    index.update("Nezuko\nTanjirou\n")
+    seen = []
+    hash_phonetic = fuzzy.TermsIndex._hash_phonetic
+    monkeypatch.setattr(
+        fuzzy.TermsIndex,
+        "_hash_phonetic",
+        staticmethod(lambda *args: seen.append(index.phonetic) or hash_phonetic(*args)),
+    )
+
+    candidates = index.phonetic_candidates(fuzzy.phonetic_key("nezko"))
+    assert seen == [None, None]
+    assert "Nezuko" in candidates